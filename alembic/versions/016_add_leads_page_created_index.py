@@ -0,0 +1,43 @@
+"""Add composite (bio_page_id, created_at, id) index on leads.
+
+Backs keyset pagination of a page's leads, newest first. Built concurrently
+so existing lead tables stay writable during the migration.
+
+Revision ID: 016_add_leads_page_created_index
+Revises: 015_notification_subscriptions
+Create Date: 2026-10-15 00:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+revision: str = "016_add_leads_page_created_index"
+down_revision: str | None = "015_notification_subscriptions"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # CONCURRENTLY can't run inside a transaction, but avoids blocking writes
+    # (lead capture) on large tables while the index builds.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_leads_bio_page_id_created_at",
+            "leads",
+            ["bio_page_id", sa.text("created_at DESC"), sa.text("id DESC")],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_leads_bio_page_id_created_at",
+            table_name="leads",
+            postgresql_concurrently=True,
+        )
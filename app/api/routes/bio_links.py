@@ -103,7 +103,7 @@ async def fetch_url_metadata(
     current_user: CurrentUser,
 ) -> URLMetadataResponse:
     """Fetch Open Graph metadata from a URL for preview."""
-    metadata = await OGMetadataService.fetch(data.url)
+    metadata = await OGMetadataService.fetch_cached(data.url)
     return URLMetadataResponse(
         title=metadata.title,
         description=metadata.description,
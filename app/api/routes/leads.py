@@ -1,6 +1,5 @@
 """Leads management routes."""
 
-import math
 from uuid import UUID
 
 from fastapi import APIRouter, HTTPException, status
@@ -18,23 +17,24 @@ async def list_leads(
     page_id: UUID,
     current_user: CurrentUser,
     db: DBSession,
-    page: int = 1,
     limit: int = 50,
     card_id: UUID | None = None,
+    cursor: str | None = None,
 ) -> LeadListResponse:
-    """List leads for a bio page with pagination."""
+    """List leads for a bio page, newest first.
+
+    Pass the returned ``next_cursor`` as ``cursor`` to fetch the next page.
+    """
     service = LeadService(db)
 
     try:
-        leads, total = await service.list_leads(
-            page_id, current_user.id, page, limit, card_id
+        leads, next_cursor = await service.list_leads(
+            page_id, current_user.id, limit, card_id, cursor
         )
-        pages = math.ceil(total / limit) if total > 0 else 1
         return LeadListResponse(
             leads=[LeadResponse.model_validate(lead) for lead in leads],
-            total=total,
-            page=page,
-            pages=pages,
+            has_more=next_cursor is not None,
+            next_cursor=next_cursor,
         )
     except ValueError as e:
         raise HTTPException(
@@ -1,9 +1,9 @@
 """Public bio page routes (no authentication required)."""
 
-from typing import Any
+import hashlib
 from uuid import UUID
 
-from fastapi import APIRouter, HTTPException, Request, status
+from fastapi import APIRouter, HTTPException, Request, Response, status
 
 from app.api.deps import DBSession
 from app.schemas.analytics import ViewRequest, ClickRequest, ClickResponse
@@ -41,24 +41,34 @@ def get_client_ip(request: Request) -> str | None:
 @router.get("/{slug}")
 async def get_public_bio_page(
     slug: str,
+    request: Request,
     db: DBSession,
-) -> dict[str, Any]:
+) -> Response:
     """
     Get public bio page with items in order.
 
+    Responses carry an ETag; clients revalidating with If-None-Match get a
+    304 when the page is unchanged.
+
     NOTE: This endpoint does NOT track page views.
     Frontend should call POST /view separately after page renders.
     """
     service = PageItemService(db)
-    result = await service.get_public_page_items(slug)
+    body = await service.get_public_page_json(slug)
 
-    if not result:
+    if body is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Bio page not found",
         )
 
-    return result
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+
+    if request.headers.get("If-None-Match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @router.post("/{slug}/view")
@@ -9,9 +9,10 @@ from app.config import settings
 engine = create_async_engine(
     settings.database_url,
     echo=settings.is_development,
-    pool_pre_ping=True,
-    pool_size=5,
-    max_overflow=10,
+    pool_pre_ping=settings.db_pool_pre_ping,
+    pool_recycle=settings.db_pool_recycle_seconds,
+    pool_size=settings.db_pool_size,
+    max_overflow=settings.db_max_overflow,
 )
 
 async_session_maker = async_sessionmaker(
@@ -28,12 +28,16 @@ from app.api.routes import (
 from app.api.routes.email_auth import router as email_auth_router
 from app.config import settings
 from app.db import engine
+from app.services.cache import close_redis
+from app.services.instagram_client import instagram_client
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler."""
     yield
+    await close_redis()
+    await instagram_client.aclose()
     await engine.dispose()
 
 
@@ -64,6 +64,7 @@ class BioLink(Base, UUIDMixin, TimestampMixin):
         "RoutingRule",
         back_populates="bio_link",
         cascade="all, delete-orphan",
+        order_by="RoutingRule.priority",
     )
     analytics_events: Mapped[list["AnalyticsEvent"]] = relationship(
         "AnalyticsEvent",
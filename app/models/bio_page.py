@@ -111,6 +111,7 @@ class BioPage(Base, UUIDMixin, TimestampMixin):
         "SocialLink",
         back_populates="bio_page",
         cascade="all, delete-orphan",
+        order_by="SocialLink.position",
     )
 
     @property
@@ -5,7 +5,7 @@ import uuid
 from datetime import datetime
 from typing import TYPE_CHECKING, Any
 
-from sqlalchemy import DateTime, Enum, ForeignKey, String, func
+from sqlalchemy import DateTime, Enum, ForeignKey, Index, String, func, text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -29,6 +29,15 @@ class Lead(Base, UUIDMixin):
 
     __tablename__ = "leads"
 
+    __table_args__ = (
+        Index(
+            "ix_leads_bio_page_id_created_at",
+            "bio_page_id",
+            text("created_at DESC"),
+            text("id DESC"),
+        ),
+    )
+
     bio_page_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True),
         ForeignKey("bio_pages.id", ondelete="CASCADE"),
@@ -28,6 +28,5 @@ class LeadListResponse(BaseModel):
     """Schema for paginated lead list response."""
 
     leads: list[LeadResponse]
-    total: int
-    page: int
-    pages: int
+    has_more: bool
+    next_cursor: str | None = None
@@ -0,0 +1,61 @@
+"""msgspec structs for webhook events consumed from RabbitMQ.
+
+Messages are decoded straight from bytes into these structs, so the worker
+never builds or walks intermediate dicts. Only fields the worker reads are
+declared; anything else in the envelope is ignored.
+
+The upstream webhook service is loosely typed: any field may be null and ids
+may arrive as numbers. Fields are declared permissively so such messages
+still decode; CommentEvent.from_webhook_payload normalizes them.
+"""
+
+import msgspec
+
+
+class WebhookUser(msgspec.Struct, frozen=True):
+    """Commenter reference inside a change value."""
+
+    id: int | str | None = None
+    username: str | None = None
+
+
+class WebhookMedia(msgspec.Struct, frozen=True):
+    """Media reference inside a change value."""
+
+    id: int | str | None = None
+    media_product_type: str | None = None
+
+
+class WebhookChangeValue(msgspec.Struct, frozen=True, rename={"from_": "from"}):
+    """Value of a single webhook change (comment fields)."""
+
+    id: int | str | None = None
+    text: str | None = None
+    from_: WebhookUser | None = None
+    media: WebhookMedia | None = None
+
+
+class WebhookChange(msgspec.Struct, frozen=True):
+    """A single entry in raw_payload.changes."""
+
+    field: str | None = None
+    value: WebhookChangeValue | None = None
+
+
+class WebhookRawPayload(msgspec.Struct, frozen=True):
+    """Meta's original webhook entry, as forwarded by the webhook service."""
+
+    changes: list[WebhookChange] | None = None
+
+
+class InstagramWebhookEvent(msgspec.Struct, frozen=True):
+    """Envelope published by the webhook service for each Instagram event."""
+
+    id: str | None = None
+    # ISO 8601 string or unix seconds (int or float). Kept raw: msgspec's
+    # datetime decoding only accepts strict RFC 3339, and unions may hold
+    # just one str-like type. CommentEvent parses it, falling back to now.
+    timestamp: int | float | str | None = None
+    event_type: str | None = None
+    account_id: int | str | None = None
+    raw_payload: WebhookRawPayload | None = None
@@ -7,6 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import BioCard, BioPage, PageItem, ItemType
 from app.schemas.bio_card import BioCardCreate, BioCardUpdate
+from app.services.cache import invalidate_public_page_on_commit
 
 
 class BioCardService:
@@ -74,7 +75,7 @@ class BioCardService:
         )
         self.db.add(page_item)
         await self.db.flush()
-        await self.db.refresh(card)
+        invalidate_public_page_on_commit(self.db, page_id)
 
         return card, position
 
@@ -129,6 +130,7 @@ class BioCardService:
 
         await self.db.flush()
         await self.db.refresh(card)
+        invalidate_public_page_on_commit(self.db, card.bio_page_id)
 
         return card
 
@@ -158,6 +160,7 @@ class BioCardService:
 
         # Recompact positions
         await self._recompact_positions(page_id)
+        invalidate_public_page_on_commit(self.db, page_id)
 
         return True
 
@@ -7,6 +7,8 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import BioLink, BioPage, PageItem, ItemType
 from app.schemas.bio_link import BioLinkCreate, BioLinkUpdate
+from app.services.cache import invalidate_public_page_on_commit
+from app.services.routing_service import invalidate_link_rules
 
 
 class BioLinkService:
@@ -72,7 +74,7 @@ class BioLinkService:
         )
         self.db.add(page_item)
         await self.db.flush()
-        await self.db.refresh(link)
+        invalidate_public_page_on_commit(self.db, page_id)
 
         return link, position
 
@@ -118,6 +120,8 @@ class BioLinkService:
 
         await self.db.flush()
         await self.db.refresh(link)
+        invalidate_public_page_on_commit(self.db, link.bio_page_id)
+        invalidate_link_rules(link_id)
 
         return link
 
@@ -147,6 +151,8 @@ class BioLinkService:
 
         # Recompact positions
         await self._recompact_positions(page_id)
+        invalidate_public_page_on_commit(self.db, page_id)
+        invalidate_link_rules(link_id)
 
         return True
 
@@ -11,6 +11,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.models import BioPage, User, RESERVED_SLUGS
 from app.models.social_link import SocialLink
 from app.schemas.bio_page import BioPageCreate, BioPageUpdate
+from app.services.cache import invalidate_public_page_on_commit
 
 
 class BioPageService:
@@ -199,6 +200,7 @@ class BioPageService:
                     self.db.add(social_link)
 
             # Commit transaction - all or nothing
+            invalidate_public_page_on_commit(self.db, page_id)
             await self.db.commit()
             await self.db.refresh(bio_page)
             return bio_page
@@ -230,6 +232,7 @@ class BioPageService:
         bio_page.is_published = False
 
         await self.db.flush()
+        invalidate_public_page_on_commit(self.db, page_id)
         return True
 
     async def publish(self, page_id: UUID, user_id: UUID) -> BioPage | None:
@@ -242,6 +245,7 @@ class BioPageService:
         bio_page.is_published = True
         await self.db.flush()
         await self.db.refresh(bio_page)
+        invalidate_public_page_on_commit(self.db, page_id)
 
         return bio_page
 
@@ -255,5 +259,6 @@ class BioPageService:
         bio_page.is_published = False
         await self.db.flush()
         await self.db.refresh(bio_page)
+        invalidate_public_page_on_commit(self.db, page_id)
 
         return bio_page
@@ -0,0 +1,145 @@
+"""Redis-backed response cache.
+
+Caching is optional: when ``REDIS_URL`` is unset every helper is a no-op and
+callers fall through to the database. Redis errors are logged and swallowed so
+a cache outage never fails a request.
+"""
+
+import asyncio
+import logging
+from uuid import UUID
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+_redis: Redis | None = None
+
+# Invalidations scheduled from the synchronous after_commit hook; held so the
+# tasks aren't garbage-collected before they finish.
+_pending_tasks: set[asyncio.Task] = set()
+
+
+def get_redis() -> Redis | None:
+    """Get the shared Redis client, or None if caching is disabled."""
+    global _redis
+    if not settings.redis_url:
+        return None
+    if _redis is None:
+        _redis = Redis.from_url(settings.redis_url)
+    return _redis
+
+
+async def close_redis() -> None:
+    """Close the shared Redis client (called on shutdown)."""
+    global _redis
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
+
+
+async def cache_get(key: str) -> bytes | None:
+    """Get a cached value, or None on miss / cache unavailable."""
+    client = get_redis()
+    if client is None:
+        return None
+    try:
+        return await client.get(key)
+    except RedisError as e:
+        logger.warning(f"Cache GET failed for {key}: {e}")
+        return None
+
+
+async def cache_set(key: str, value: bytes | str, ttl_seconds: int) -> None:
+    """Set a cached value with a TTL."""
+    client = get_redis()
+    if client is None:
+        return
+    try:
+        await client.set(key, value, ex=ttl_seconds)
+    except RedisError as e:
+        logger.warning(f"Cache SET failed for {key}: {e}")
+
+
+async def cache_delete(*keys: str) -> None:
+    """Delete cached values."""
+    client = get_redis()
+    if client is None or not keys:
+        return
+    try:
+        await client.delete(*keys)
+    except RedisError as e:
+        logger.warning(f"Cache DELETE failed for {keys}: {e}")
+
+
+# Public bio page cache
+#
+# Pages are looked up by slug but written by page_id, so alongside the payload
+# we keep a page_id -> slug pointer used to find the entry to invalidate.
+
+
+def public_page_key(slug: str) -> str:
+    """Cache key for a rendered public bio page."""
+    return f"pub:bio:{slug}"
+
+
+def public_page_slug_key(page_id: UUID) -> str:
+    """Cache key mapping a bio page ID to its cached slug."""
+    return f"pub:bio:page:{page_id}"
+
+
+async def set_public_page(slug: str, page_id: UUID, body: bytes) -> None:
+    """Cache a rendered public bio page."""
+    ttl = settings.public_bio_cache_ttl_seconds
+    await cache_set(public_page_key(slug), body, ttl)
+    await cache_set(public_page_slug_key(page_id), slug, ttl)
+
+
+async def invalidate_public_page(page_id: UUID) -> None:
+    """Drop the cached public rendering of a bio page after a write."""
+    slug_key = public_page_slug_key(page_id)
+    slug = await cache_get(slug_key)
+    if slug is None:
+        return
+    await cache_delete(public_page_key(slug.decode()), slug_key)
+
+
+# Page ids whose cache entries should be dropped once the session commits,
+# kept in Session.info under this key.
+_PENDING_PAGES_KEY = "invalidate_public_pages"
+
+
+def invalidate_public_page_on_commit(db: AsyncSession, page_id: UUID) -> None:
+    """Drop the cached public rendering of a bio page once db commits.
+
+    Invalidating before the commit would let a concurrent public read cache
+    the old rows again for the whole TTL.
+    """
+    db.info.setdefault(_PENDING_PAGES_KEY, set()).add(page_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed_pages(session: Session) -> None:
+    page_ids = session.info.pop(_PENDING_PAGES_KEY, None)
+    if not page_ids:
+        return
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        logger.warning(f"No event loop to invalidate public pages {page_ids}")
+        return
+    for page_id in page_ids:
+        task = loop.create_task(invalidate_public_page(page_id))
+        _pending_tasks.add(task)
+        task.add_done_callback(_pending_tasks.discard)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_pages(session: Session) -> None:
+    session.info.pop(_PENDING_PAGES_KEY, None)
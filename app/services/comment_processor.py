@@ -5,7 +5,6 @@ import re
 import unicodedata
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
-from typing import Any
 from uuid import UUID
 
 from sqlalchemy import select, update
@@ -27,8 +26,15 @@ from app.models.automation import (
     MessageType,
     TriggerType,
 )
+from app.schemas.webhook import (
+    InstagramWebhookEvent,
+    WebhookChangeValue,
+    WebhookMedia,
+    WebhookUser,
+)
 from app.services.instagram_client import (
     PermanentGraphAPIError,
+    ReplyTo,
     RetryableGraphAPIError,
     instagram_client,
 )
@@ -36,6 +42,24 @@ from app.services.instagram_client import (
 logger = logging.getLogger(__name__)
 
 
+def _as_str(value: int | str | None) -> str:
+    """Normalize a webhook id that may be null or numeric to a string."""
+    return "" if value is None else str(value)
+
+
+def _parse_timestamp(value: int | float | str | None) -> datetime:
+    """Parse a webhook timestamp (ISO 8601 or unix seconds), defaulting to now."""
+    try:
+        if isinstance(value, (int, float)):
+            return datetime.fromtimestamp(value, timezone.utc)
+        if isinstance(value, str):
+            parsed = datetime.fromisoformat(value)
+            return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+    except (ValueError, OverflowError, OSError):
+        pass
+    return datetime.now(timezone.utc)
+
+
 @dataclass
 class DMSendResult:
     """Outcome of a single Graph-API DM attempt.
@@ -79,7 +103,9 @@ class CommentEvent:
     timestamp: datetime
 
     @classmethod
-    def from_webhook_payload(cls, payload: dict[str, Any]) -> "CommentEvent | None":
+    def from_webhook_payload(
+        cls, payload: InstagramWebhookEvent
+    ) -> "CommentEvent | None":
         """Parse webhook payload into CommentEvent.
 
         Expected payload structure:
@@ -104,11 +130,10 @@ class CommentEvent:
             }
         }
         """
-        envelope_id = payload.get("id")
-        account_id = payload.get("account_id")
+        envelope_id = payload.id
+        account_id = _as_str(payload.account_id)
         try:
-            raw = payload.get("raw_payload", {})
-            changes = raw.get("changes", [])
+            changes = payload.raw_payload.changes if payload.raw_payload else None
 
             if not changes:
                 logger.warning(
@@ -118,30 +143,27 @@ class CommentEvent:
                 return None
 
             change = changes[0]
-            if change.get("field") != "comments":
+            if change.field != "comments":
                 logger.warning(
-                    f"unexpected field type: {change.get('field')} "
+                    f"unexpected field type: {change.field} "
                     f"envelope_id={envelope_id} account_id={account_id}"
                 )
                 return None
 
-            value = change.get("value", {})
-            from_data = value.get("from", {})
-            media_data = value.get("media", {})
+            value = change.value or WebhookChangeValue()
+            from_data = value.from_ or WebhookUser()
+            media_data = value.media or WebhookMedia()
 
             return cls(
                 message_id=envelope_id or "",
-                account_id=account_id or "",
-                comment_id=value.get("id", ""),
-                comment_text=value.get("text", ""),
-                commenter_id=from_data.get("id", ""),
-                commenter_username=from_data.get("username", ""),
-                media_id=media_data.get("id", ""),
-                media_type=media_data.get("media_product_type", ""),
-                timestamp=datetime.fromisoformat(
-                    payload.get("timestamp", datetime.now(timezone.utc).isoformat())
-                    .replace("Z", "+00:00")
-                ),
+                account_id=account_id,
+                comment_id=_as_str(value.id),
+                comment_text=value.text or "",
+                commenter_id=_as_str(from_data.id),
+                commenter_username=from_data.username or "",
+                media_id=_as_str(media_data.id),
+                media_type=media_data.media_product_type or "",
+                timestamp=_parse_timestamp(payload.timestamp),
             )
         except (KeyError, ValueError, TypeError, AttributeError):
             logger.exception(
@@ -161,7 +183,7 @@ class CommentProcessor:
     def __init__(self, db: AsyncSession):
         self.db = db
 
-    async def process(self, payload: dict[str, Any]) -> bool:
+    async def process(self, payload: InstagramWebhookEvent) -> bool:
         """Process a comment webhook event.
 
         Returns True if processed successfully, False otherwise.
@@ -493,7 +515,7 @@ class CommentProcessor:
                     access_token=access_token,
                     recipient_id=event.comment_id,
                     elements=automation.carousel_elements,
-                    reply_to="COMMENT",
+                    reply_to=ReplyTo.COMMENT,
                 )
             elif (
                 automation.message_type == MessageType.BUTTON
@@ -504,14 +526,14 @@ class CommentProcessor:
                     recipient_id=event.comment_id,
                     text=automation.button_template["text"],
                     buttons=automation.button_template["buttons"],
-                    reply_to="COMMENT",
+                    reply_to=ReplyTo.COMMENT,
                 )
             else:
                 response = await instagram_client.send_message(
                     access_token=access_token,
                     recipient_id=event.comment_id,
                     text=automation.dm_message_template,
-                    reply_to="COMMENT",
+                    reply_to=ReplyTo.COMMENT,
                 )
 
             message_id = response.get("message_id") if isinstance(response, dict) else None
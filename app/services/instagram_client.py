@@ -1,10 +1,13 @@
 """Instagram OAuth and Graph API client."""
 
+import enum
 from datetime import datetime, timedelta, timezone
+from functools import lru_cache
 from typing import Any
 from urllib.parse import urlencode
 
 import httpx
+import orjson
 from cryptography.fernet import Fernet
 
 from app.config import settings
@@ -12,6 +15,20 @@ from app.config import settings
 MEDIA_FIELDS = "id,caption,media_type,media_url,permalink,thumbnail_url,timestamp,username"
 
 
+class ReplyTo(str, enum.Enum):
+    """What a DM's recipient ID refers to."""
+
+    COMMENT = "COMMENT"  # private reply to a comment (recipient.comment_id)
+    USER = "USER"  # existing conversation (recipient.id)
+
+
+def _recipient(reply_to: ReplyTo, recipient_id: str) -> dict[str, str]:
+    """Build the /me/messages recipient object."""
+    if reply_to is ReplyTo.COMMENT:
+        return {"comment_id": recipient_id}
+    return {"id": recipient_id}
+
+
 class GraphAPIError(Exception):
     """Base class for classified Graph API errors.
 
@@ -91,6 +108,14 @@ def _classify_http_error(err: httpx.HTTPStatusError) -> GraphAPIError:
     )
 
 
+@lru_cache(maxsize=1)
+def get_cipher() -> Fernet:
+    """Get the process-wide Fernet cipher for token encryption."""
+    if not settings.encryption_key:
+        raise ValueError("ENCRYPTION_KEY environment variable is required")
+    return Fernet(settings.encryption_key.encode())
+
+
 class InstagramClient:
     """Client for Instagram OAuth and Graph API."""
 
@@ -99,16 +124,27 @@ class InstagramClient:
         self.client_id = settings.instagram_client_id
         self.client_secret = settings.instagram_client_secret
         self.redirect_uri = settings.instagram_redirect_uri
-        self._cipher = None
+        self._http: httpx.AsyncClient | None = None
+
+    @property
+    def http(self) -> httpx.AsyncClient:
+        """Shared HTTP client; keeps Graph API connections alive between calls."""
+        if self._http is None or self._http.is_closed:
+            self._http = httpx.AsyncClient(
+                transport=httpx.AsyncHTTPTransport(http2=True, retries=2),
+            )
+        return self._http
+
+    async def aclose(self) -> None:
+        """Close the shared HTTP client (called on shutdown)."""
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
 
     @property
     def cipher(self) -> Fernet:
-        """Lazy-load the Fernet cipher for token encryption."""
-        if self._cipher is None:
-            if not settings.encryption_key:
-                raise ValueError("ENCRYPTION_KEY environment variable is required")
-            self._cipher = Fernet(settings.encryption_key.encode())
-        return self._cipher
+        """Fernet cipher for token encryption (shared across instances)."""
+        return get_cipher()
 
     def encrypt_token(self, token: str) -> str:
         """Encrypt an access token for storage."""
@@ -138,79 +174,78 @@ class InstagramClient:
         Raises:
             ValueError: With sanitized error message (safe to expose to users)
         """
-        async with httpx.AsyncClient() as client:
-            # Exchange code for short-lived token
-            try:
-                response = await client.post(
-                    "https://api.instagram.com/oauth/access_token",
-                    data={
-                        "client_id": self.client_id,
-                        "client_secret": self.client_secret,
-                        "grant_type": "authorization_code",
-                        "redirect_uri": self.redirect_uri,
-                        "code": code,
-                    },
-                )
-                response.raise_for_status()
-                short_lived_data = response.json()
-            except httpx.HTTPStatusError as e:
-                # Extract Instagram's error message without exposing request details
-                try:
-                    error_data = e.response.json()
-                    error_msg = error_data.get("error_message", "Token exchange failed")
-                except Exception:
-                    error_msg = "Token exchange failed"
-                raise ValueError(error_msg) from None
-
-            # Exchange for long-lived token
+        # Exchange code for short-lived token
+        try:
+            response = await self.http.post(
+                "https://api.instagram.com/oauth/access_token",
+                data={
+                    "client_id": self.client_id,
+                    "client_secret": self.client_secret,
+                    "grant_type": "authorization_code",
+                    "redirect_uri": self.redirect_uri,
+                    "code": code,
+                },
+            )
+            response.raise_for_status()
+            short_lived_data = response.json()
+        except httpx.HTTPStatusError as e:
+            # Extract Instagram's error message without exposing request details
             try:
-                long_lived_response = await client.get(
-                    f"{self.base_url}/access_token",
-                    params={
-                        "grant_type": "ig_exchange_token",
-                        "client_secret": self.client_secret,
-                        "access_token": short_lived_data["access_token"],
-                    },
-                )
-                long_lived_response.raise_for_status()
-                long_lived_data = long_lived_response.json()
-            except httpx.HTTPStatusError as e:
-                # Extract Instagram's error message without exposing request details
-                try:
-                    error_data = e.response.json()
-                    error_msg = error_data.get("error_message", "Long-lived token exchange failed")
-                except Exception:
-                    error_msg = "Long-lived token exchange failed"
-                raise ValueError(error_msg) from None
-
-            # Calculate expiry
-            expires_in = long_lived_data.get("expires_in", 5184000)  # Default 60 days
-            expires_at = datetime.now(timezone.utc) + timedelta(seconds=expires_in)
-
-            # Fetch the professional account ID (IG_ID) + username via /me.
-            # /oauth/access_token returns only the app-scoped id; Meta's
-            # webhook payloads use the IG_ID, so we need both.
-            long_lived_token = long_lived_data["access_token"]
+                error_data = e.response.json()
+                error_msg = error_data.get("error_message", "Token exchange failed")
+            except Exception:
+                error_msg = "Token exchange failed"
+            raise ValueError(error_msg) from None
+
+        # Exchange for long-lived token
+        try:
+            long_lived_response = await self.http.get(
+                f"{self.base_url}/access_token",
+                params={
+                    "grant_type": "ig_exchange_token",
+                    "client_secret": self.client_secret,
+                    "access_token": short_lived_data["access_token"],
+                },
+            )
+            long_lived_response.raise_for_status()
+            long_lived_data = long_lived_response.json()
+        except httpx.HTTPStatusError as e:
+            # Extract Instagram's error message without exposing request details
             try:
-                me_response = await client.get(
-                    f"{self.base_url}/me",
-                    params={
-                        "fields": "user_id,username",
-                        "access_token": long_lived_token,
-                    },
-                )
-                me_response.raise_for_status()
-                me_data = me_response.json()
-            except httpx.HTTPStatusError:
-                raise ValueError("Failed to fetch Instagram account profile") from None
-
-            return {
-                "access_token": long_lived_token,
-                "ig_id": str(me_data["user_id"]),
-                "app_scoped_id": str(short_lived_data["user_id"]),
-                "username": me_data.get("username", ""),
-                "expires_at": expires_at,
-            }
+                error_data = e.response.json()
+                error_msg = error_data.get("error_message", "Long-lived token exchange failed")
+            except Exception:
+                error_msg = "Long-lived token exchange failed"
+            raise ValueError(error_msg) from None
+
+        # Calculate expiry
+        expires_in = long_lived_data.get("expires_in", 5184000)  # Default 60 days
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=expires_in)
+
+        # Fetch the professional account ID (IG_ID) + username via /me.
+        # /oauth/access_token returns only the app-scoped id; Meta's
+        # webhook payloads use the IG_ID, so we need both.
+        long_lived_token = long_lived_data["access_token"]
+        try:
+            me_response = await self.http.get(
+                f"{self.base_url}/me",
+                params={
+                    "fields": "user_id,username",
+                    "access_token": long_lived_token,
+                },
+            )
+            me_response.raise_for_status()
+            me_data = me_response.json()
+        except httpx.HTTPStatusError:
+            raise ValueError("Failed to fetch Instagram account profile") from None
+
+        return {
+            "access_token": long_lived_token,
+            "ig_id": str(me_data["user_id"]),
+            "app_scoped_id": str(short_lived_data["user_id"]),
+            "username": me_data.get("username", ""),
+            "expires_at": expires_at,
+        }
 
     async def get_user_media(
         self, access_token: str, after_cursor: str | None = None
@@ -223,60 +258,60 @@ class InstagramClient:
         if after_cursor:
             params["after"] = after_cursor
 
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/me/media",
-                params=params,
-            )
-            response.raise_for_status()
-            return response.json()
+        response = await self.http.get(
+            f"{self.base_url}/me/media",
+            params=params,
+        )
+        response.raise_for_status()
+        return response.json()
 
     async def refresh_long_lived_token(self, access_token: str) -> dict[str, Any]:
         """Refresh a long-lived access token."""
-        async with httpx.AsyncClient() as client:
-            response = await client.get(
-                f"{self.base_url}/refresh_access_token",
-                params={
-                    "grant_type": "ig_refresh_token",
-                    "access_token": access_token,
-                },
-            )
-            response.raise_for_status()
-            data = response.json()
+        response = await self.http.get(
+            f"{self.base_url}/refresh_access_token",
+            params={
+                "grant_type": "ig_refresh_token",
+                "access_token": access_token,
+            },
+        )
+        response.raise_for_status()
+        data = response.json()
 
-            expires_in = data.get("expires_in", 5184000)
-            expires_at = datetime.now(timezone.utc) + timedelta(seconds=expires_in)
+        expires_in = data.get("expires_in", 5184000)
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=expires_in)
 
-            return {
-                "access_token": data["access_token"],
-                "expires_at": expires_at,
-            }
+        return {
+            "access_token": data["access_token"],
+            "expires_at": expires_at,
+        }
 
     async def send_message(
-        self, access_token: str, recipient_id: str, text: str, reply_to: str
+        self, access_token: str, recipient_id: str, text: str, reply_to: ReplyTo
     ) -> dict[str, Any]:
         """Send a DM to a user via the /me/messages shortcut."""
-
-        if reply_to.lower() == "comment":
-            recipient_id_name = "comment_id"
-        else:
-            recipient_id_name = "id"
         payload = {
-            "recipient": {recipient_id_name: recipient_id},
+            "recipient": _recipient(reply_to, recipient_id),
             "message": {"text": text},
         }
+        return await self._post_message(access_token, payload)
 
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    f"{self.base_url}/me/messages",
-                    headers={"Authorization": f"Bearer {access_token}"},
-                    json=payload,
-                )
-                response.raise_for_status()
-                return response.json()
-            except httpx.HTTPStatusError as e:
-                raise _classify_http_error(e) from e
+    async def _post_message(
+        self, access_token: str, payload: dict[str, Any]
+    ) -> dict[str, Any]:
+        """POST a message payload to /me/messages."""
+        try:
+            response = await self.http.post(
+                f"{self.base_url}/me/messages",
+                headers={
+                    "Authorization": f"Bearer {access_token}",
+                    "Content-Type": "application/json",
+                },
+                content=orjson.dumps(payload),
+            )
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPStatusError as e:
+            raise _classify_http_error(e) from e
 
     async def subscribe_app(
         self,
@@ -290,33 +325,27 @@ class InstagramClient:
         after app-level URL verification. Idempotent — safe to re-invoke.
         """
         fields = subscribed_fields or ["comments"]
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    f"{self.base_url}/{instagram_user_id}/subscribed_apps",
-                    headers={"Authorization": f"Bearer {access_token}"},
-                    params={"subscribed_fields": ",".join(fields)},
-                )
-                response.raise_for_status()
-                return response.json()
-            except httpx.HTTPStatusError as e:
-                raise _classify_http_error(e) from e
+        try:
+            response = await self.http.post(
+                f"{self.base_url}/{instagram_user_id}/subscribed_apps",
+                headers={"Authorization": f"Bearer {access_token}"},
+                params={"subscribed_fields": ",".join(fields)},
+            )
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPStatusError as e:
+            raise _classify_http_error(e) from e
 
     async def send_carousel(
         self,
         access_token: str,
         recipient_id: str,
         elements: list[dict[str, Any]],
-        reply_to: str,
+        reply_to: ReplyTo,
     ) -> dict[str, Any]:
         """Send a carousel (generic template) DM via the /me/messages shortcut."""
-        if reply_to.lower() == "comment":
-            recipient_key = "comment_id"
-        else:
-            recipient_key = "id"
-
         payload = {
-            "recipient": {recipient_key: recipient_id},
+            "recipient": _recipient(reply_to, recipient_id),
             "message": {
                 "attachment": {
                     "type": "template",
@@ -327,18 +356,7 @@ class InstagramClient:
                 }
             },
         }
-
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    f"{self.base_url}/me/messages",
-                    headers={"Authorization": f"Bearer {access_token}"},
-                    json=payload,
-                )
-                response.raise_for_status()
-                return response.json()
-            except httpx.HTTPStatusError as e:
-                raise _classify_http_error(e) from e
+        return await self._post_message(access_token, payload)
 
     async def send_button_template(
         self,
@@ -346,12 +364,11 @@ class InstagramClient:
         recipient_id: str,
         text: str,
         buttons: list[dict[str, Any]],
-        reply_to: str,
+        reply_to: ReplyTo,
     ) -> dict[str, Any]:
         """Send a button-template DM via /me/messages."""
-        recipient_key = "comment_id" if reply_to.lower() == "comment" else "id"
         payload = {
-            "recipient": {recipient_key: recipient_id},
+            "recipient": _recipient(reply_to, recipient_id),
             "message": {
                 "attachment": {
                     "type": "template",
@@ -363,18 +380,7 @@ class InstagramClient:
                 }
             },
         }
-
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    f"{self.base_url}/me/messages",
-                    headers={"Authorization": f"Bearer {access_token}"},
-                    json=payload,
-                )
-                response.raise_for_status()
-                return response.json()
-            except httpx.HTTPStatusError as e:
-                raise _classify_http_error(e) from e
+        return await self._post_message(access_token, payload)
 
     async def reply_to_comment(
         self, access_token: str, comment_id: str, message: str
@@ -389,17 +395,16 @@ class InstagramClient:
         - Cannot reply to hidden comments
         - Cannot reply to comments on live videos
         """
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.post(
-                    f"{self.base_url}/{comment_id}/replies",
-                    headers={"Authorization": f"Bearer {access_token}"},
-                    params={"message": message},
-                )
-                response.raise_for_status()
-                return response.json()
-            except httpx.HTTPStatusError as e:
-                raise _classify_http_error(e) from e
+        try:
+            response = await self.http.post(
+                f"{self.base_url}/{comment_id}/replies",
+                headers={"Authorization": f"Bearer {access_token}"},
+                params={"message": message},
+            )
+            response.raise_for_status()
+            return response.json()
+        except httpx.HTTPStatusError as e:
+            raise _classify_http_error(e) from e
 
     async def get_comment_replies(
         self, access_token: str, comment_id: str
@@ -412,13 +417,12 @@ class InstagramClient:
         Returns list of comments with timestamp, text, and id.
         """
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.base_url}/{comment_id}/replies",
-                    params={"access_token": access_token},
-                )
-                response.raise_for_status()
-                return response.json()
+            response = await self.http.get(
+                f"{self.base_url}/{comment_id}/replies",
+                params={"access_token": access_token},
+            )
+            response.raise_for_status()
+            return response.json()
         except httpx.HTTPStatusError as e:
             try:
                 error_data = e.response.json()
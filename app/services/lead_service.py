@@ -1,17 +1,34 @@
 """Service for lead capture and management."""
 
+import base64
 import csv
 import io
 from datetime import datetime
 from typing import Any
 from uuid import UUID
 
-from sqlalchemy import select, func
+from sqlalchemy import select, tuple_
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
 
 from app.models import Lead, BioPage, BioCard, SourceType
 
 
+def _encode_cursor(lead: Lead) -> str:
+    """Encode a lead's (created_at, id) position as an opaque page cursor."""
+    raw = f"{lead.created_at.isoformat()}|{lead.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    """Decode a page cursor back into its (created_at, id) position."""
+    try:
+        created_at, lead_id = base64.urlsafe_b64decode(cursor).decode().split("|")
+        return datetime.fromisoformat(created_at), UUID(lead_id)
+    except ValueError:
+        raise ValueError("Invalid cursor")
+
+
 class LeadService:
     """Service for lead capture and export operations."""
 
@@ -58,11 +75,10 @@ class LeadService:
             bio_card_id=card_id,
             email=email,
             source_type=SourceType.CARD,
-            metadata=metadata,
+            lead_metadata=metadata,
         )
         self.db.add(lead)
         await self.db.flush()
-        await self.db.refresh(lead)
 
         return lead
 
@@ -70,34 +86,39 @@ class LeadService:
         self,
         page_id: UUID,
         user_id: UUID,
-        page: int = 1,
         limit: int = 50,
         card_id: UUID | None = None,
-    ) -> tuple[list[Lead], int]:
-        """List leads for a bio page with pagination."""
+        cursor: str | None = None,
+    ) -> tuple[list[Lead], str | None]:
+        """List leads for a bio page, newest first, with keyset pagination.
+
+        Returns the leads and a cursor for the next page (None on the last page).
+        """
         bio_page = await self._get_bio_page(page_id, user_id)
         if not bio_page:
             raise ValueError("Bio page not found or doesn't belong to user")
 
         # Build query
         query = select(Lead).where(Lead.bio_page_id == page_id)
-        count_query = select(func.count(Lead.id)).where(Lead.bio_page_id == page_id)
 
         if card_id:
             query = query.where(Lead.bio_card_id == card_id)
-            count_query = count_query.where(Lead.bio_card_id == card_id)
 
-        # Get total count
-        result = await self.db.execute(count_query)
-        total = result.scalar() or 0
+        if cursor:
+            created_at, lead_id = _decode_cursor(cursor)
+            query = query.where(tuple_(Lead.created_at, Lead.id) < (created_at, lead_id))
 
-        # Get paginated leads
-        offset = (page - 1) * limit
-        query = query.order_by(Lead.created_at.desc()).offset(offset).limit(limit)
+        # Fetch one extra row to learn whether another page exists
+        query = query.order_by(Lead.created_at.desc(), Lead.id.desc()).limit(limit + 1)
         result = await self.db.execute(query)
         leads = list(result.scalars().all())
 
-        return leads, total
+        next_cursor = None
+        if len(leads) > limit:
+            leads = leads[:limit]
+            next_cursor = _encode_cursor(leads[-1])
+
+        return leads, next_cursor
 
     async def get_lead(self, lead_id: UUID, user_id: UUID) -> Lead | None:
         """Get a lead by ID if it belongs to user's page."""
@@ -129,22 +150,14 @@ class LeadService:
         if not bio_page:
             raise ValueError("Bio page not found or doesn't belong to user")
 
-        # Get all leads with card info
-        result = await self.db.execute(
+        # Stream leads with their card in one query
+        leads = await self.db.stream_scalars(
             select(Lead)
+            .options(joinedload(Lead.bio_card))
             .where(Lead.bio_page_id == page_id)
             .order_by(Lead.created_at.desc())
+            .execution_options(yield_per=500)
         )
-        leads = list(result.scalars().all())
-
-        # Get card headlines for mapping
-        card_ids = [lead.bio_card_id for lead in leads if lead.bio_card_id]
-        cards_map = {}
-        if card_ids:
-            result = await self.db.execute(
-                select(BioCard).where(BioCard.id.in_(card_ids))
-            )
-            cards_map = {card.id: card.headline for card in result.scalars().all()}
 
         # Generate CSV
         output = io.StringIO()
@@ -153,11 +166,11 @@ class LeadService:
             "email", "phone", "source", "card", "country", "captured_at"
         ])
 
-        for lead in leads:
-            card_headline = cards_map.get(lead.bio_card_id, "")
+        async for lead in leads:
+            card_headline = lead.bio_card.headline if lead.bio_card else ""
             country = ""
-            if lead.metadata:
-                country = lead.metadata.get("country", "")
+            if lead.lead_metadata:
+                country = lead.lead_metadata.get("country", "")
 
             writer.writerow([
                 lead.email,
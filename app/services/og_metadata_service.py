@@ -1,11 +1,17 @@
 """Service for fetching Open Graph metadata from URLs."""
 
 import asyncio
-from dataclasses import dataclass
-from urllib.parse import urlparse
+import hashlib
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urljoin, urlparse
 
 import httpx
-from bs4 import BeautifulSoup
+import orjson
+from selectolax.lexbor import LexborHTMLParser
+
+from app.services.cache import cache_get, cache_set
 
 
 @dataclass
@@ -25,11 +31,37 @@ class OGMetadataService:
     TIMEOUT = 10.0  # seconds
     MAX_CONTENT_LENGTH = 1_000_000  # 1MB max
 
+    # Cache TTL when upstream sends no lifetime; an upstream Cache-Control
+    # max-age or Expires is honoured but capped at CACHE_MAX_TTL
+    CACHE_TTL = 6 * 60 * 60  # 6 hours
+    CACHE_MAX_TTL = 24 * 60 * 60  # 24 hours
+
+    # Cache-Control directives that forbid reusing the response
+    NO_REUSE_DIRECTIVES = frozenset({"no-store", "no-cache", "private"})
+
     USER_AGENT = (
         "Mozilla/5.0 (compatible; LinkPreviewBot/1.0; "
         "+https://example.com/bot)"
     )
 
+    @classmethod
+    async def fetch_cached(cls, url: str) -> OGMetadata:
+        """
+        Fetch Open Graph metadata, served from cache when available.
+
+        Successful fetches are cached by SHA256(url).
+        """
+        key = f"og:{hashlib.sha256(url.encode()).hexdigest()}"
+
+        cached = await cache_get(key)
+        if cached is not None:
+            return OGMetadata(**orjson.loads(cached))
+
+        metadata, ttl = await cls._fetch(url)
+        if ttl:
+            await cache_set(key, orjson.dumps(asdict(metadata)), ttl)
+        return metadata
+
     @classmethod
     async def fetch(cls, url: str) -> OGMetadata:
         """
@@ -37,60 +69,127 @@ class OGMetadataService:
 
         Returns OGMetadata with available fields, or empty if fetch fails.
         """
+        metadata, _ = await cls._fetch(url)
+        return metadata
+
+    @classmethod
+    async def _fetch(cls, url: str) -> tuple[OGMetadata, int | None]:
+        """
+        Fetch Open Graph metadata and the TTL it may be cached for.
+
+        The TTL is None when the result should not be cached (failed fetch or
+        upstream forbids reuse).
+        """
         try:
             # Validate URL
             parsed = urlparse(url)
             if parsed.scheme not in ("http", "https"):
-                return OGMetadata()
+                return OGMetadata(), None
 
             async with httpx.AsyncClient(
                 timeout=cls.TIMEOUT,
                 follow_redirects=True,
                 max_redirects=5,
             ) as client:
-                response = await client.get(
+                async with client.stream(
+                    "GET",
                     url,
                     headers={
                         "User-Agent": cls.USER_AGENT,
                         "Accept": "text/html,application/xhtml+xml",
                     },
-                )
+                ) as response:
+                    if response.status_code != 200:
+                        return OGMetadata(), None
+
+                    # Check content type
+                    content_type = response.headers.get("content-type", "")
+                    if "text/html" not in content_type and "application/xhtml" not in content_type:
+                        return OGMetadata(), None
+
+                    # Check content length
+                    content_length = response.headers.get("content-length")
+                    if content_length and int(content_length) > cls.MAX_CONTENT_LENGTH:
+                        return OGMetadata(), None
+
+                    # Read at most MAX_CONTENT_LENGTH bytes regardless of what the
+                    # server claims, and stop once the <head> (where the meta
+                    # tags live) has been received.
+                    buf = bytearray()
+                    async for chunk in response.aiter_bytes():
+                        buf += chunk
+                        if len(buf) >= cls.MAX_CONTENT_LENGTH:
+                            del buf[cls.MAX_CONTENT_LENGTH:]
+                            break
+                        if b"</head>" in buf[-(len(chunk) + 6):].lower():
+                            break
+
+                    html = buf.decode(response.encoding or "utf-8", errors="replace")
+                    return cls._parse_html(html, str(response.url)), cls._cache_ttl(response.headers)
 
-                if response.status_code != 200:
-                    return OGMetadata()
-
-                # Check content type
-                content_type = response.headers.get("content-type", "")
-                if "text/html" not in content_type and "application/xhtml" not in content_type:
-                    return OGMetadata()
+        except (httpx.HTTPError, asyncio.TimeoutError, Exception):
+            return OGMetadata(), None
 
-                # Check content length
-                content_length = response.headers.get("content-length")
-                if content_length and int(content_length) > cls.MAX_CONTENT_LENGTH:
-                    return OGMetadata()
+    @classmethod
+    def _cache_ttl(cls, headers: httpx.Headers) -> int | None:
+        """Derive a cache TTL from Cache-Control/Expires.
 
-                html = response.text
-                return cls._parse_html(html, url)
+        Returns None when upstream forbids reuse (no-store, no-cache, private,
+        max-age=0 or an Expires in the past). Falls back to CACHE_TTL only when
+        upstream gives no usable lifetime.
+        """
+        cache_control = headers.get("cache-control", "").lower()
+        directives = [d.strip() for d in cache_control.split(",")]
+        if cls.NO_REUSE_DIRECTIVES.intersection(directives):
+            return None
 
-        except (httpx.HTTPError, asyncio.TimeoutError, Exception):
-            return OGMetadata()
+        max_age = next(
+            (d.split("=", 1)[1].strip() for d in directives if d.startswith("max-age=")),
+            None,
+        )
+        expires = headers.get("expires")
+        if max_age is not None and max_age.isdigit():
+            ttl = int(max_age)
+        elif expires:
+            try:
+                expires_at = parsedate_to_datetime(expires)
+                ttl = int((expires_at - datetime.now(timezone.utc)).total_seconds())
+            except (TypeError, ValueError):
+                return cls.CACHE_TTL
+        else:
+            return cls.CACHE_TTL
+
+        if ttl <= 0:
+            return None
+        return min(ttl, cls.CACHE_MAX_TTL)
 
     @classmethod
     def _parse_html(cls, html: str, original_url: str) -> OGMetadata:
         """Parse HTML and extract Open Graph metadata."""
-        soup = BeautifulSoup(html, "html.parser")
+        tree = LexborHTMLParser(html)
+
+        # Index meta tags in a single pass; first tag per key wins
+        by_property: dict[str, str | None] = {}
+        by_name: dict[str, str | None] = {}
+        for node in tree.css("meta"):
+            attrs = node.attributes
+            content = attrs.get("content")
+            if attrs.get("property"):
+                by_property.setdefault(attrs["property"], content)
+            if attrs.get("name"):
+                by_name.setdefault(attrs["name"], content)
 
         def get_meta(property_name: str) -> str | None:
             """Get meta tag content by property or name."""
             # Try og: prefix first
-            tag = soup.find("meta", property=property_name)
-            if tag and tag.get("content"):
-                return tag["content"].strip()
+            content = by_property.get(property_name)
+            if content:
+                return content.strip()
 
             # Try without prefix
-            tag = soup.find("meta", attrs={"name": property_name})
-            if tag and tag.get("content"):
-                return tag["content"].strip()
+            content = by_name.get(property_name)
+            if content:
+                return content.strip()
 
             return None
 
@@ -103,9 +202,9 @@ class OGMetadataService:
 
         # Fallbacks for title
         if not og_title:
-            title_tag = soup.find("title")
+            title_tag = tree.css_first("title")
             if title_tag:
-                og_title = title_tag.get_text().strip()
+                og_title = title_tag.text().strip()
 
         # Fallbacks for description
         if not og_description:
@@ -116,14 +215,8 @@ class OGMetadataService:
             og_image = get_meta("twitter:image")
 
         # Make image URL absolute
-        if og_image and not og_image.startswith(("http://", "https://")):
-            parsed = urlparse(original_url)
-            if og_image.startswith("//"):
-                og_image = f"{parsed.scheme}:{og_image}"
-            elif og_image.startswith("/"):
-                og_image = f"{parsed.scheme}://{parsed.netloc}{og_image}"
-            else:
-                og_image = f"{parsed.scheme}://{parsed.netloc}/{og_image}"
+        if og_image:
+            og_image = urljoin(original_url, og_image)
 
         return OGMetadata(
             title=og_title,
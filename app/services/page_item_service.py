@@ -4,12 +4,19 @@ from datetime import datetime, timezone
 from typing import Any
 from uuid import UUID
 
-from sqlalchemy import select
+import orjson
+from sqlalchemy import and_, case, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
 from app.models import BioPage, BioLink, BioCard, PageItem, ItemType, SocialLink
 from app.schemas.page_item import ReorderRequest
+from app.services.cache import (
+    cache_get,
+    invalidate_public_page_on_commit,
+    public_page_key,
+    set_public_page,
+)
 
 
 class PageItemService:
@@ -39,8 +46,23 @@ class PageItemService:
 
         return await self._get_items_with_data(page_id)
 
-    async def get_public_page_items(self, slug: str) -> dict[str, Any] | None:
-        """Get public bio page with ordered items."""
+    async def get_public_page_json(self, slug: str) -> bytes | None:
+        """Get the public bio page as serialized JSON, served from cache when fresh."""
+        cached = await cache_get(public_page_key(slug))
+        if cached is not None:
+            return cached
+
+        page = await self._get_public_page(slug)
+        if not page:
+            return None
+
+        page_id, data = page
+        body = orjson.dumps(data)
+        await set_public_page(slug, page_id, body)
+        return body
+
+    async def _get_public_page(self, slug: str) -> tuple[UUID, dict[str, Any]] | None:
+        """Load a published bio page by slug, returning (page_id, payload)."""
         # Get bio page by slug
         result = await self.db.execute(
             select(BioPage).where(
@@ -54,28 +76,10 @@ class PageItemService:
         if not bio_page:
             return None
 
-        # Get ordered items with visibility filter
         items = await self._get_items_with_data(bio_page.id, public=True)
+        social_links = await self._get_public_social_links(bio_page.id)
 
-        # Get active social links
-        social_links_result = await self.db.execute(
-            select(SocialLink)
-            .where(
-                SocialLink.bio_page_id == bio_page.id,
-                SocialLink.is_active == True,
-            )
-            .order_by(SocialLink.position)
-        )
-        social_links = [
-            {
-                "id": str(link.id),
-                "platform": link.platform.value,
-                "url": link.url,
-            }
-            for link in social_links_result.scalars().all()
-        ]
-
-        return {
+        return bio_page.id, {
             "slug": bio_page.slug,
             "display_name": bio_page.display_name,
             "bio_text": bio_page.bio_text,
@@ -88,47 +92,56 @@ class PageItemService:
             "social_links": social_links,
         }
 
+    async def _get_public_social_links(self, page_id: UUID) -> list[dict[str, Any]]:
+        """Get active social links for the public page, in display order."""
+        result = await self.db.execute(
+            select(SocialLink.id, SocialLink.platform, SocialLink.url)
+            .where(
+                SocialLink.bio_page_id == page_id,
+                SocialLink.is_active == True,
+            )
+            .order_by(SocialLink.position)
+        )
+        return [
+            {
+                "id": str(link_id),
+                "platform": platform.value,
+                "url": url,
+            }
+            for link_id, platform, url in result.all()
+        ]
+
     async def _get_items_with_data(
         self, page_id: UUID, public: bool = False
     ) -> list[dict[str, Any]]:
         """Get page items with their associated data."""
         now = datetime.now(timezone.utc)
 
-        # Get ordered page items
+        # Get ordered page items joined to their link/card in one round-trip
         result = await self.db.execute(
-            select(PageItem)
+            select(PageItem, BioLink, BioCard)
+            .outerjoin(
+                BioLink,
+                and_(
+                    PageItem.item_type == ItemType.LINK,
+                    PageItem.item_id == BioLink.id,
+                ),
+            )
+            .outerjoin(
+                BioCard,
+                and_(
+                    PageItem.item_type == ItemType.CARD,
+                    PageItem.item_id == BioCard.id,
+                ),
+            )
             .where(PageItem.bio_page_id == page_id)
             .order_by(PageItem.position)
         )
-        page_items = list(result.scalars().all())
-
-        # Collect IDs by type
-        link_ids = [pi.item_id for pi in page_items if pi.item_type == ItemType.LINK]
-        card_ids = [pi.item_id for pi in page_items if pi.item_type == ItemType.CARD]
-
-        # Batch fetch links
-        links_map = {}
-        if link_ids:
-            result = await self.db.execute(
-                select(BioLink).where(BioLink.id.in_(link_ids))
-            )
-            for link in result.scalars().all():
-                links_map[link.id] = link
-
-        # Batch fetch cards
-        cards_map = {}
-        if card_ids:
-            result = await self.db.execute(
-                select(BioCard).where(BioCard.id.in_(card_ids))
-            )
-            for card in result.scalars().all():
-                cards_map[card.id] = card
 
         # Build result
         items = []
-        for pi in page_items:
+        for pi, link, card in result.all():
             if pi.item_type == ItemType.LINK:
-                link = links_map.get(pi.item_id)
                 if not link:
                     continue
                 # Check visibility for public
@@ -153,7 +166,6 @@ class PageItemService:
                         "thumbnail_url": link.thumbnail_url,
                     }
             else:
-                card = cards_map.get(pi.item_id)
                 if not card:
                     continue
                 # Check visibility for public
@@ -204,28 +216,46 @@ class PageItemService:
         if not bio_page:
             raise ValueError("Bio page not found or doesn't belong to user")
 
-        # Get all page items for this page
+        # Get the keys of all page items for this page
         result = await self.db.execute(
-            select(PageItem).where(PageItem.bio_page_id == page_id)
+            select(PageItem.item_type, PageItem.item_id).where(
+                PageItem.bio_page_id == page_id
+            )
         )
-        existing_items = {
-            (pi.item_type, pi.item_id): pi
-            for pi in result.scalars().all()
-        }
+        existing_keys = {(item_type, item_id) for item_type, item_id in result.all()}
 
         # Validate all items exist and belong to this page
-        for idx, item in enumerate(request.items):
-            key = (item.type, item.item_id)
-            if key not in existing_items:
+        for item in request.items:
+            if (item.type, item.item_id) not in existing_keys:
                 raise ValueError(
                     f"Item {item.item_id} of type {item.type} not found on this page"
                 )
 
-        # Update positions
-        for idx, item in enumerate(request.items):
-            key = (item.type, item.item_id)
-            page_item = existing_items[key]
-            page_item.position = idx
+        if not request.items:
+            return True
+
+        # Update all positions in a single statement
+        await self.db.execute(
+            update(PageItem)
+            .where(PageItem.bio_page_id == page_id)
+            .values(
+                position=case(
+                    *(
+                        (
+                            and_(
+                                PageItem.item_type == item.type,
+                                PageItem.item_id == item.item_id,
+                            ),
+                            idx,
+                        )
+                        for idx, item in enumerate(request.items)
+                    ),
+                    else_=PageItem.position,
+                )
+            )
+            .execution_options(synchronize_session=False)
+        )
 
         await self.db.flush()
+        invalidate_public_page_on_commit(self.db, page_id)
         return True
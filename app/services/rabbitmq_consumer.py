@@ -1,17 +1,18 @@
 """RabbitMQ consumer service for processing Instagram webhook events."""
 
 import asyncio
-import json
 import logging
 from collections import OrderedDict
 from typing import Awaitable, Callable
 
 import aio_pika
+import msgspec
 from aio_pika import IncomingMessage
 from aio_pika.abc import AbstractRobustChannel, AbstractRobustConnection
 from aio_pika.exceptions import ChannelClosed
 
 from app.config import settings
+from app.schemas.webhook import InstagramWebhookEvent
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +29,8 @@ DELIVERY_COUNTER_MAX_ENTRIES = 10_000
 QUEUE_LOOKUP_RETRIES = 3
 QUEUE_LOOKUP_BACKOFF_SECONDS = 2.0
 
+_decoder = msgspec.json.Decoder(InstagramWebhookEvent)
+
 
 class RabbitMQConsumer:
     """RabbitMQ consumer with robust connection handling."""
@@ -45,7 +48,7 @@ class RabbitMQConsumer:
 
         self._connection = await aio_pika.connect_robust(settings.rabbitmq_url)
         self._channel = await self._connection.channel()
-        await self._channel.set_qos(prefetch_count=10)
+        await self._channel.set_qos(prefetch_count=settings.worker_concurrency)
 
         logger.info("Successfully connected to RabbitMQ")
 
@@ -66,10 +69,13 @@ class RabbitMQConsumer:
     async def consume(
         self,
         queue_name: str,
-        callback: Callable[[dict], Awaitable[bool]],
+        callback: Callable[[InstagramWebhookEvent], Awaitable[bool]],
     ) -> None:
         """Start consuming messages from a queue.
 
+        Up to ``settings.worker_concurrency`` messages are processed at once;
+        each is acked/nacked independently when its callback finishes.
+
         Args:
             queue_name: Name of the queue to consume from
             callback: Async function to process each message.
@@ -83,12 +89,29 @@ class RabbitMQConsumer:
         logger.info(f"Starting to consume from queue: {queue_name}")
         self._is_running = True
 
-        async with queue.iterator() as queue_iter:
-            async for message in queue_iter:
-                if not self._is_running:
-                    break
+        slots = asyncio.Semaphore(settings.worker_concurrency)
+        in_flight: set[asyncio.Task] = set()
 
+        async def run(message: IncomingMessage) -> None:
+            try:
                 await self._process_message(message, callback)
+            finally:
+                slots.release()
+
+        try:
+            async with queue.iterator() as queue_iter:
+                async for message in queue_iter:
+                    if not self._is_running:
+                        break
+
+                    await slots.acquire()
+                    task = asyncio.create_task(run(message))
+                    in_flight.add(task)
+                    task.add_done_callback(in_flight.discard)
+        finally:
+            # Let in-flight messages finish so they are acked/nacked cleanly.
+            if in_flight:
+                await asyncio.gather(*in_flight, return_exceptions=True)
 
     async def _get_queue_with_retry(self, queue_name: str):
         """Look up a queue declared by the webhook service.
@@ -112,7 +135,9 @@ class RabbitMQConsumer:
                 # Channel is dead after NOT_FOUND — re-open before retrying.
                 if self._connection:
                     self._channel = await self._connection.channel()
-                    await self._channel.set_qos(prefetch_count=10)
+                    await self._channel.set_qos(
+                        prefetch_count=settings.worker_concurrency
+                    )
                 await asyncio.sleep(QUEUE_LOOKUP_BACKOFF_SECONDS)
         raise RuntimeError(
             f"Queue '{queue_name}' does not exist after "
@@ -143,22 +168,21 @@ class RabbitMQConsumer:
     async def _process_message(
         self,
         message: IncomingMessage,
-        callback: Callable[[dict], Awaitable[bool]],
+        callback: Callable[[InstagramWebhookEvent], Awaitable[bool]],
     ) -> None:
         """Process a single message with error handling and a redelivery cap."""
         envelope_id: str | None = None
         try:
-            body = message.body.decode("utf-8")
-            payload = json.loads(body)
-            envelope_id = payload.get("id") if isinstance(payload, dict) else None
+            payload = _decoder.decode(message.body)
+            envelope_id = payload.id
 
             delivery_num = self._bump_delivery_count(envelope_id)
             if delivery_num > MAX_DELIVERIES:
                 logger.error(
                     "Dropping message after exceeding delivery cap "
                     f"envelope_id={envelope_id} delivery_num={delivery_num} "
-                    f"max={MAX_DELIVERIES} account_id={payload.get('account_id')} "
-                    f"event_type={payload.get('event_type')}"
+                    f"max={MAX_DELIVERIES} account_id={payload.account_id} "
+                    f"event_type={payload.event_type}"
                 )
                 await message.nack(requeue=False)
                 self._clear_delivery_count(envelope_id)
@@ -182,7 +206,17 @@ class RabbitMQConsumer:
                     f"{MAX_DELIVERIES})"
                 )
 
-        except json.JSONDecodeError as e:
+        except msgspec.ValidationError as e:
+            # Well-formed JSON that doesn't match the envelope schema: a
+            # contract change upstream, not line noise. Reject without requeue
+            # so it dead-letters (if configured) instead of vanishing.
+            logger.error(
+                f"Message failed schema validation: {e} "
+                f"body={message.body[:500]!r}"
+            )
+            await message.nack(requeue=False)
+
+        except msgspec.DecodeError as e:
             logger.error(f"Failed to parse message as JSON: {e}")
             await message.ack()
 
@@ -1,16 +1,115 @@
 """Service for routing rules and smart link resolution."""
 
 from datetime import datetime, timezone
-from typing import Any
+from functools import lru_cache
+from typing import Any, Callable
 from uuid import UUID
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
-from sqlalchemy import select
+from cachetools import TTLCache
+from sqlalchemy import Select, and_, delete, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import settings
 from app.models import BioLink, BioPage, RoutingRule, RuleType
 from app.schemas.routing_rule import RoutingRuleCreate, RoutingRuleUpdate
 
 
+@lru_cache(maxsize=512)
+def _get_tz(name: str) -> ZoneInfo:
+    """Get a timezone by IANA name, falling back to UTC if unknown or not a string."""
+    try:
+        return ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError, TypeError):
+        return ZoneInfo("UTC")
+
+
+# A compiled rule: returns its destination URL if the visitor matches, else None
+RulePredicate = Callable[[dict[str, Any]], str | None]
+
+
+def _compile_country_rule(config: dict[str, Any], url: str) -> RulePredicate:
+    """Match visitors from any of the configured countries."""
+    countries = frozenset(config.get("countries", []))
+
+    def matches(visitor_data: dict[str, Any]) -> str | None:
+        return url if visitor_data.get("country") in countries else None
+
+    return matches
+
+
+def _compile_device_rule(config: dict[str, Any], url: str) -> RulePredicate:
+    """Match visitors on any of the configured device types."""
+    devices = frozenset(config.get("devices", []))
+
+    def matches(visitor_data: dict[str, Any]) -> str | None:
+        return url if visitor_data.get("device_type") in devices else None
+
+    return matches
+
+
+def _compile_time_rule(config: dict[str, Any], url: str) -> RulePredicate:
+    """Match visits inside the configured hours and weekdays."""
+    tz_name = config.get("timezone", "UTC")
+    # Unhashable values (lists, dicts) would fail in lru_cache before _get_tz runs
+    tz = _get_tz(tz_name if isinstance(tz_name, str) else "UTC")
+    start_hour = config.get("start_hour", 0)
+    end_hour = config.get("end_hour", 24)
+
+    # Bit (d - 1) set for each allowed ISO weekday d (1=Monday, 7=Sunday)
+    days_mask = 0
+    for day in config.get("days", range(1, 8)):
+        if isinstance(day, int) and 1 <= day <= 7:
+            days_mask |= 1 << (day - 1)
+
+    def matches(visitor_data: dict[str, Any]) -> str | None:
+        now = datetime.now(tz)
+        current_hour = now.hour
+
+        # Check day
+        if not (days_mask >> (now.isoweekday() - 1)) & 1:
+            return None
+
+        # Check hour
+        if start_hour <= end_hour:
+            # Normal range (e.g., 9-17)
+            in_window = start_hour <= current_hour < end_hour
+        else:
+            # Overnight range (e.g., 22-6)
+            in_window = current_hour >= start_hour or current_hour < end_hour
+        return url if in_window else None
+
+    return matches
+
+
+_COMPILERS: dict[RuleType, Callable[[dict[str, Any], str], RulePredicate]] = {
+    RuleType.COUNTRY: _compile_country_rule,
+    RuleType.DEVICE: _compile_device_rule,
+    RuleType.TIME: _compile_time_rule,
+}
+
+
+def _compile_rule(
+    rule_type: RuleType, config: dict[str, Any], url: str
+) -> RulePredicate | None:
+    """Turn a rule's config into a predicate, hoisting all parsing out of it."""
+    compiler = _COMPILERS.get(rule_type)
+    return compiler(config, url) if compiler else None
+
+
+# Per-process cache of link_id -> (fallback URL, compiled active rules by
+# priority). Writes through RoutingService / BioLinkService invalidate it
+# locally; other processes pick up changes when the entry expires.
+_RULE_CACHE: TTLCache[UUID, tuple[str, list[RulePredicate]]] = TTLCache(
+    maxsize=10_000, ttl=settings.routing_rule_cache_ttl_seconds
+)
+
+
+def invalidate_link_rules(link_id: UUID) -> None:
+    """Drop a smart link's cached rule set after a write."""
+    _RULE_CACHE.pop(link_id, None)
+
+
 class RoutingService:
     """Service for routing rule operations."""
 
@@ -30,6 +129,15 @@ class RoutingService:
         )
         return result.scalar_one_or_none()
 
+    @staticmethod
+    def _owned_link_ids(user_id: UUID) -> Select:
+        """Subquery of IDs of links on the user's (non-deleted) pages."""
+        return (
+            select(BioLink.id)
+            .join(BioPage)
+            .where(BioPage.user_id == user_id, BioPage.deleted_at.is_(None))
+        )
+
     async def create_rule(
         self, link_id: UUID, data: RoutingRuleCreate, user_id: UUID
     ) -> RoutingRule:
@@ -48,7 +156,7 @@ class RoutingService:
         )
         self.db.add(rule)
         await self.db.flush()
-        await self.db.refresh(rule)
+        invalidate_link_rules(link_id)
 
         return rule
 
@@ -68,130 +176,115 @@ class RoutingService:
 
     async def list_rules(self, link_id: UUID, user_id: UUID) -> list[RoutingRule]:
         """List all routing rules for a link."""
-        link = await self._get_link(link_id, user_id)
-        if not link:
-            raise ValueError("Bio link not found or doesn't belong to user")
-
         result = await self.db.execute(
             select(RoutingRule)
-            .where(RoutingRule.bio_link_id == link_id)
+            .join(BioLink)
+            .join(BioPage)
+            .where(
+                BioLink.id == link_id,
+                BioPage.user_id == user_id,
+                BioPage.deleted_at.is_(None),
+            )
             .order_by(RoutingRule.priority)
         )
-        return list(result.scalars().all())
+        rules = list(result.scalars().all())
+
+        # No rows is either a link without rules or not the user's link
+        if not rules and not await self._get_link(link_id, user_id):
+            raise ValueError("Bio link not found or doesn't belong to user")
+
+        return rules
 
     async def update_rule(
         self, rule_id: UUID, data: RoutingRuleUpdate, user_id: UUID
     ) -> RoutingRule | None:
         """Update a routing rule."""
-        rule = await self.get_rule(rule_id, user_id)
-        if not rule:
-            return None
-
         update_data = data.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(rule, field, value)
+        if not update_data:
+            return await self.get_rule(rule_id, user_id)
 
-        await self.db.flush()
-        await self.db.refresh(rule)
+        result = await self.db.execute(
+            update(RoutingRule)
+            .where(
+                RoutingRule.id == rule_id,
+                RoutingRule.bio_link_id.in_(self._owned_link_ids(user_id)),
+            )
+            .values(**update_data)
+            .returning(RoutingRule)
+        )
+        rule = result.scalar_one_or_none()
+        if rule:
+            invalidate_link_rules(rule.bio_link_id)
 
         return rule
 
     async def delete_rule(self, rule_id: UUID, user_id: UUID) -> bool:
         """Delete a routing rule."""
-        rule = await self.get_rule(rule_id, user_id)
-        if not rule:
+        result = await self.db.execute(
+            delete(RoutingRule)
+            .where(
+                RoutingRule.id == rule_id,
+                RoutingRule.bio_link_id.in_(self._owned_link_ids(user_id)),
+            )
+            .returning(RoutingRule.bio_link_id)
+        )
+        link_id = result.scalar_one_or_none()
+        if link_id is None:
             return False
 
-        await self.db.delete(rule)
-        await self.db.flush()
-
+        invalidate_link_rules(link_id)
         return True
 
     async def resolve_destination(
         self, link_id: UUID, visitor_data: dict[str, Any]
     ) -> str:
         """Evaluate rules in priority order, return first match or fallback."""
-        # Get link with its rules
-        result = await self.db.execute(
-            select(BioLink).where(BioLink.id == link_id)
-        )
-        link = result.scalar_one_or_none()
-
-        if not link:
-            raise ValueError("Link not found")
-
-        # Get active rules ordered by priority
-        result = await self.db.execute(
-            select(RoutingRule)
-            .where(
-                RoutingRule.bio_link_id == link_id,
-                RoutingRule.is_active == True,
-            )
-            .order_by(RoutingRule.priority)
-        )
-        rules = list(result.scalars().all())
+        cached = _RULE_CACHE.get(link_id)
+        if cached is None:
+            cached = await self._load_rules(link_id)
+            _RULE_CACHE[link_id] = cached
+        fallback_url, rules = cached
 
         # Evaluate each rule
         for rule in rules:
-            if self._matches_rule(rule, visitor_data):
-                return rule.destination_url
+            destination_url = rule(visitor_data)
+            if destination_url is not None:
+                return destination_url
 
         # Fallback to default URL
-        return link.url
-
-    def _matches_rule(
-        self, rule: RoutingRule, visitor_data: dict[str, Any]
-    ) -> bool:
-        """Check if visitor data matches a routing rule."""
-        config = rule.rule_config
-
-        if rule.rule_type == RuleType.COUNTRY:
-            countries = config.get("countries", [])
-            visitor_country = visitor_data.get("country")
-            return visitor_country in countries
-
-        elif rule.rule_type == RuleType.DEVICE:
-            devices = config.get("devices", [])
-            visitor_device = visitor_data.get("device_type")
-            return visitor_device in devices
-
-        elif rule.rule_type == RuleType.TIME:
-            return self._matches_time_rule(config, visitor_data)
-
-        return False
-
-    def _matches_time_rule(
-        self, config: dict[str, Any], visitor_data: dict[str, Any]
-    ) -> bool:
-        """Check if current time matches a time-based rule."""
-        try:
-            import pytz
-        except ImportError:
-            # Fallback if pytz not available
-            return False
-
-        tz_name = config.get("timezone", "UTC")
-        try:
-            tz = pytz.timezone(tz_name)
-        except pytz.UnknownTimeZoneError:
-            tz = pytz.UTC
-
-        now = datetime.now(tz)
-        current_hour = now.hour
-        current_weekday = now.isoweekday()  # 1=Monday, 7=Sunday
+        return fallback_url
 
-        start_hour = config.get("start_hour", 0)
-        end_hour = config.get("end_hour", 24)
-        days = config.get("days", [1, 2, 3, 4, 5, 6, 7])
+    async def _load_rules(self, link_id: UUID) -> tuple[str, list[RulePredicate]]:
+        """Load a link's URL and compile its active rules in priority order."""
+        result = await self.db.execute(
+            select(
+                BioLink.url,
+                RoutingRule.rule_type,
+                RoutingRule.rule_config,
+                RoutingRule.destination_url,
+            )
+            .outerjoin(
+                RoutingRule,
+                and_(
+                    RoutingRule.bio_link_id == BioLink.id,
+                    RoutingRule.is_active == True,
+                ),
+            )
+            .where(BioLink.id == link_id)
+            .order_by(RoutingRule.priority)
+        )
+        rows = result.all()
 
-        # Check day
-        if current_weekday not in days:
-            return False
+        if not rows:
+            raise ValueError("Link not found")
 
-        # Check hour
-        if start_hour <= end_hour:
-            # Normal range (e.g., 9-17)
-            return start_hour <= current_hour < end_hour
-        else:
-            # Overnight range (e.g., 22-6)
-            return current_hour >= start_hour or current_hour < end_hour
+        # Plain row tuples, no ORM instances; a link without active rules
+        # yields a single row whose rule columns are all NULL
+        rules = []
+        for _, rule_type, rule_config, destination_url in rows:
+            if rule_type is None:
+                continue
+            rule = _compile_rule(rule_type, rule_config, destination_url)
+            if rule is not None:
+                rules.append(rule)
+        return rows[0][0], rules
@@ -1,14 +1,15 @@
 """Service for social link operations."""
 
-from uuid import UUID
+from uuid import UUID, uuid4
 
-from sqlalchemy import select, func
+from sqlalchemy import Select, case, delete, func, insert, literal, select, true, update
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import BioPage
 from app.models.social_link import SocialLink, SocialPlatform
 from app.schemas.social_link import SocialLinkCreate, SocialLinkUpdate, SocialLinkReorderRequest
+from app.services.cache import invalidate_public_page_on_commit
 
 
 class SocialLinkService:
@@ -28,14 +29,13 @@ class SocialLinkService:
         )
         return result.scalar_one_or_none()
 
-    async def _get_next_position(self, page_id: UUID) -> int:
-        """Get the next available position for a social link."""
-        result = await self.db.execute(
-            select(func.coalesce(func.max(SocialLink.position), -1) + 1).where(
-                SocialLink.bio_page_id == page_id
-            )
+    @staticmethod
+    def _owned_page_ids(user_id: UUID) -> Select:
+        """Subquery of IDs of the user's (non-deleted) bio pages."""
+        return select(BioPage.id).where(
+            BioPage.user_id == user_id,
+            BioPage.deleted_at.is_(None),
         )
-        return result.scalar() or 0
 
     async def create(
         self, page_id: UUID, data: SocialLinkCreate, user_id: UUID
@@ -45,26 +45,31 @@ class SocialLinkService:
         if not bio_page:
             raise ValueError("Bio page not found or doesn't belong to user")
 
-        # Get next position
-        position = await self._get_next_position(page_id)
-
-        # Create social link
-        social_link = SocialLink(
-            bio_page_id=page_id,
-            platform=data.platform,
-            url=data.url,
-            position=position,
-            is_active=True,
-        )
-        self.db.add(social_link)
+        # Create social link at the next position in a single INSERT ... SELECT
+        next_position = select(
+            literal(uuid4(), SocialLink.id.type),
+            literal(page_id, SocialLink.bio_page_id.type),
+            literal(data.platform, SocialLink.platform.type),
+            literal(data.url, SocialLink.url.type),
+            func.coalesce(func.max(SocialLink.position), -1) + 1,
+            true(),
+        ).where(SocialLink.bio_page_id == page_id)
 
         try:
-            await self.db.flush()
-            await self.db.refresh(social_link)
+            result = await self.db.execute(
+                insert(SocialLink)
+                .from_select(
+                    ["id", "bio_page_id", "platform", "url", "position", "is_active"],
+                    next_position,
+                )
+                .returning(SocialLink)
+            )
+            social_link = result.scalar_one()
         except IntegrityError:
             await self.db.rollback()
             raise ValueError(f"A {data.platform.value} link already exists for this page")
 
+        invalidate_public_page_on_commit(self.db, page_id)
         return social_link
 
     async def get_by_id(
@@ -84,16 +89,23 @@ class SocialLinkService:
 
     async def list_for_page(self, page_id: UUID, user_id: UUID) -> list[SocialLink]:
         """List all social links for a bio page."""
-        bio_page = await self._get_bio_page(page_id, user_id)
-        if not bio_page:
-            raise ValueError("Bio page not found or doesn't belong to user")
-
         result = await self.db.execute(
             select(SocialLink)
-            .where(SocialLink.bio_page_id == page_id)
+            .join(BioPage)
+            .where(
+                BioPage.id == page_id,
+                BioPage.user_id == user_id,
+                BioPage.deleted_at.is_(None),
+            )
             .order_by(SocialLink.position)
         )
-        return list(result.scalars().all())
+        social_links = list(result.scalars().all())
+
+        # No rows is either an empty page or not the user's page
+        if not social_links and not await self._get_bio_page(page_id, user_id):
+            raise ValueError("Bio page not found or doesn't belong to user")
+
+        return social_links
 
     async def list_public_for_page(self, page_id: UUID) -> list[SocialLink]:
         """List all active social links for a public bio page."""
@@ -111,33 +123,42 @@ class SocialLinkService:
         self, social_link_id: UUID, data: SocialLinkUpdate, user_id: UUID
     ) -> SocialLink | None:
         """Update a social link."""
-        social_link = await self.get_by_id(social_link_id, user_id)
-        if not social_link:
-            return None
-
         update_data = data.model_dump(exclude_unset=True)
-        for field, value in update_data.items():
-            setattr(social_link, field, value)
+        if not update_data:
+            return await self.get_by_id(social_link_id, user_id)
 
-        await self.db.flush()
-        await self.db.refresh(social_link)
+        result = await self.db.execute(
+            update(SocialLink)
+            .where(
+                SocialLink.id == social_link_id,
+                SocialLink.bio_page_id.in_(self._owned_page_ids(user_id)),
+            )
+            .values(**update_data)
+            .returning(SocialLink)
+        )
+        social_link = result.scalar_one_or_none()
+        if social_link:
+            invalidate_public_page_on_commit(self.db, social_link.bio_page_id)
 
         return social_link
 
     async def delete(self, social_link_id: UUID, user_id: UUID) -> bool:
         """Delete a social link."""
-        social_link = await self.get_by_id(social_link_id, user_id)
-        if not social_link:
+        result = await self.db.execute(
+            delete(SocialLink)
+            .where(
+                SocialLink.id == social_link_id,
+                SocialLink.bio_page_id.in_(self._owned_page_ids(user_id)),
+            )
+            .returning(SocialLink.bio_page_id)
+        )
+        page_id = result.scalar_one_or_none()
+        if page_id is None:
             return False
 
-        page_id = social_link.bio_page_id
-
-        # Delete social link
-        await self.db.delete(social_link)
-        await self.db.flush()
-
         # Recompact positions
         await self._recompact_positions(page_id)
+        invalidate_public_page_on_commit(self.db, page_id)
 
         return True
 
@@ -149,35 +170,55 @@ class SocialLinkService:
         if not bio_page:
             raise ValueError("Bio page not found or doesn't belong to user")
 
-        # Get all social links for this page
-        result = await self.db.execute(
-            select(SocialLink).where(SocialLink.bio_page_id == page_id)
-        )
-        existing_links = {link.id: link for link in result.scalars().all()}
+        if not request.items:
+            return True
 
         # Validate all items exist and belong to this page
-        for item in request.items:
-            if item.id not in existing_links:
-                raise ValueError(f"Social link {item.id} not found on this page")
-
-        # Update positions
-        for item in request.items:
-            existing_links[item.id].position = item.position
+        ids = {item.id for item in request.items}
+        result = await self.db.execute(
+            select(func.count(SocialLink.id)).where(
+                SocialLink.id.in_(ids),
+                SocialLink.bio_page_id == page_id,
+            )
+        )
+        if result.scalar_one() != len(ids):
+            raise ValueError("One or more social links not found on this page")
+
+        # Update all positions in a single statement
+        await self.db.execute(
+            update(SocialLink)
+            .where(SocialLink.id.in_(ids))
+            .values(
+                position=case(
+                    {item.id: item.position for item in request.items},
+                    value=SocialLink.id,
+                )
+            )
+            .execution_options(synchronize_session=False)
+        )
 
         await self.db.flush()
+        invalidate_public_page_on_commit(self.db, page_id)
         return True
 
     async def _recompact_positions(self, page_id: UUID) -> None:
         """Recompact positions after deletion to remove gaps."""
-        result = await self.db.execute(
-            select(SocialLink)
+        ranked = (
+            select(
+                SocialLink.id,
+                (func.row_number().over(order_by=SocialLink.position) - 1).label(
+                    "new_position"
+                ),
+            )
             .where(SocialLink.bio_page_id == page_id)
-            .order_by(SocialLink.position)
+            .subquery()
+        )
+        await self.db.execute(
+            update(SocialLink)
+            .where(
+                SocialLink.id == ranked.c.id,
+                SocialLink.position != ranked.c.new_position,
+            )
+            .values(position=ranked.c.new_position)
+            .execution_options(synchronize_session=False)
         )
-        links = list(result.scalars().all())
-
-        for idx, link in enumerate(links):
-            if link.position != idx:
-                link.position = idx
-
-        await self.db.flush()
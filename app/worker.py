@@ -7,12 +7,13 @@ import asyncio
 import logging
 import signal
 import sys
-from typing import Any
 
 from app.config import settings
 from app.db import async_session_maker
+from app.schemas.webhook import InstagramWebhookEvent
 from app.services.comment_processor import CommentProcessor
 from app.services.email.dispatcher import EmailDispatcher
+from app.services.instagram_client import instagram_client
 from app.services.rabbitmq_consumer import rabbitmq_consumer
 
 # Queue names - these are defined by the webhook service
@@ -34,26 +35,35 @@ class Worker:
     def __init__(self):
         self._shutdown_event = asyncio.Event()
 
-    async def process_comment(self, payload: dict[str, Any]) -> bool:
+    async def process_comment(self, payload: InstagramWebhookEvent) -> bool:
         """Process a single comment event.
 
         This is called for each message consumed from RabbitMQ.
         CommentProcessor owns commit/rollback — it commits mid-flow so the
         'pending' DMSentLog row lands before the Graph API side effect.
         """
+        # Closing the session rolls back anything left uncommitted.
         async with async_session_maker() as session:
             try:
                 processor = CommentProcessor(session)
                 return await processor.process(payload)
             except Exception as e:
                 logger.error(f"Error processing comment: {e}", exc_info=True)
-                await session.rollback()
                 return False
 
     async def run(self) -> None:
         """Run the worker process."""
         logger.info("Starting automation worker...")
 
+        # Each in-flight message holds a DB session; the email dispatcher needs one more.
+        pool_capacity = settings.db_pool_size + settings.db_max_overflow
+        if settings.worker_concurrency >= pool_capacity:
+            logger.warning(
+                f"WORKER_CONCURRENCY={settings.worker_concurrency} leaves no DB "
+                f"connection headroom (pool {settings.db_pool_size} + overflow "
+                f"{settings.db_max_overflow}); messages will wait for connections"
+            )
+
         try:
             loop = asyncio.get_running_loop()
             for sig in (signal.SIGINT, signal.SIGTERM):
@@ -78,6 +88,7 @@ class Worker:
                 except asyncio.CancelledError:
                     pass
             await rabbitmq_consumer.disconnect()
+            await instagram_client.aclose()
             logger.info("Worker stopped")
 
     async def _run_rabbitmq_with_retry(self) -> None:
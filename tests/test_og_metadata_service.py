@@ -0,0 +1,47 @@
+"""Tests for OGMetadataService cache TTL derivation."""
+
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import httpx
+import pytest
+
+from app.services.og_metadata_service import OGMetadataService
+
+
+def _ttl(**headers: str) -> int | None:
+    return OGMetadataService._cache_ttl(
+        httpx.Headers({k.replace("_", "-"): v for k, v in headers.items()})
+    )
+
+
+@pytest.mark.parametrize(
+    "cache_control",
+    ["no-store", "no-cache", "private", "max-age=0", "public, max-age=0", "private, max-age=600"],
+)
+def test_no_reuse_directives_disable_caching(cache_control):
+    assert _ttl(cache_control=cache_control) is None
+
+
+def test_short_max_age_is_honoured():
+    assert _ttl(cache_control="public, max-age=120") == 120
+
+
+def test_long_max_age_is_capped():
+    assert _ttl(cache_control="max-age=31536000") == OGMetadataService.CACHE_MAX_TTL
+
+
+def test_future_expires_is_honoured():
+    expires = format_datetime(datetime.now(timezone.utc) + timedelta(minutes=10), usegmt=True)
+    assert 0 < _ttl(expires=expires) <= 600
+
+
+def test_past_expires_disables_caching():
+    expires = format_datetime(datetime.now(timezone.utc) - timedelta(minutes=10), usegmt=True)
+    assert _ttl(expires=expires) is None
+
+
+def test_no_upstream_lifetime_uses_default():
+    assert _ttl() == OGMetadataService.CACHE_TTL
+    assert _ttl(cache_control="public") == OGMetadataService.CACHE_TTL
+    assert _ttl(expires="not a date") == OGMetadataService.CACHE_TTL
@@ -0,0 +1,117 @@
+"""Tests for RabbitMQConsumer message decoding and ack/nack handling."""
+
+import asyncio
+from datetime import datetime, timezone
+
+import orjson
+
+from app.schemas.webhook import InstagramWebhookEvent
+from app.services.comment_processor import CommentEvent
+from app.services.rabbitmq_consumer import RabbitMQConsumer
+
+
+class FakeMessage:
+    """Minimal stand-in for aio_pika.IncomingMessage."""
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.acked = False
+        self.nacked_requeue: bool | None = None
+
+    async def ack(self) -> None:
+        self.acked = True
+
+    async def nack(self, requeue: bool = True) -> None:
+        self.nacked_requeue = requeue
+
+
+def _envelope(**overrides) -> dict:
+    envelope = {
+        "id": "envelope-1",
+        "timestamp": "2026-01-18T12:11:04.631004Z",
+        "event_type": "comments",
+        "account_id": "17841477945568576",
+        "raw_payload": {
+            "changes": [
+                {
+                    "field": "comments",
+                    "value": {
+                        "id": "18008498738674951",
+                        "text": "Location",
+                        "from": {"id": "2151717415361060", "username": "user123"},
+                        "media": {"id": "18332496949209541", "media_product_type": "REELS"},
+                    },
+                }
+            ]
+        },
+    }
+    envelope.update(overrides)
+    return envelope
+
+
+def _consume(body: bytes) -> tuple[FakeMessage, list[InstagramWebhookEvent]]:
+    received: list[InstagramWebhookEvent] = []
+
+    async def callback(payload: InstagramWebhookEvent) -> bool:
+        received.append(payload)
+        return True
+
+    message = FakeMessage(body)
+    asyncio.run(RabbitMQConsumer()._process_message(message, callback))
+    return message, received
+
+
+def test_float_timestamp_is_processed():
+    message, received = _consume(orjson.dumps(_envelope(timestamp=1700000000.5)))
+
+    assert message.acked
+    assert len(received) == 1
+    event = CommentEvent.from_webhook_payload(received[0])
+    assert event is not None
+    assert event.timestamp == datetime.fromtimestamp(1700000000.5, timezone.utc)
+
+
+def test_non_rfc3339_timestamp_is_processed():
+    message, received = _consume(orjson.dumps(_envelope(timestamp="2024-01-01 10:00")))
+
+    assert message.acked
+    event = CommentEvent.from_webhook_payload(received[0])
+    assert event.timestamp == datetime(2024, 1, 1, 10, 0, tzinfo=timezone.utc)
+
+
+def test_unparseable_timestamp_falls_back_to_now():
+    before = datetime.now(timezone.utc)
+    message, received = _consume(orjson.dumps(_envelope(timestamp="yesterday")))
+
+    assert message.acked
+    event = CommentEvent.from_webhook_payload(received[0])
+    assert event.timestamp >= before
+
+
+def test_null_and_numeric_fields_are_normalized():
+    envelope = _envelope(account_id=17841477945568576)
+    value = envelope["raw_payload"]["changes"][0]["value"]
+    value["text"] = None
+    value["from"]["id"] = 2151717415361060
+    message, received = _consume(orjson.dumps(envelope))
+
+    assert message.acked
+    event = CommentEvent.from_webhook_payload(received[0])
+    assert event.account_id == "17841477945568576"
+    assert event.comment_text == ""
+    assert event.commenter_id == "2151717415361060"
+
+
+def test_schema_mismatch_is_dead_lettered():
+    message, received = _consume(orjson.dumps(_envelope(raw_payload={"changes": "nope"})))
+
+    assert received == []
+    assert not message.acked
+    assert message.nacked_requeue is False
+
+
+def test_malformed_json_is_acked():
+    message, received = _consume(b"{not json")
+
+    assert received == []
+    assert message.acked
@@ -0,0 +1,100 @@
+"""Instagram Graph API and console helpers shared by the scripts in tools/.
+
+Not a standalone script: imported by send_dm.py, send_carousel.py and
+test_automation.py, which run with this directory on sys.path.
+"""
+
+import asyncio
+import os
+
+import httpx
+import orjson
+from dotenv import load_dotenv
+
+load_dotenv()
+
+GRAPH_API_URL = os.getenv("INSTAGRAM_GRAPH_API_URL", "https://graph.instagram.com")
+# Graph API maximum page size for comment listings
+COMMENTS_PAGE_SIZE = 100
+# Max comment fetches in flight at once
+FETCH_CONCURRENCY = 10
+# Section rules for console output
+SEP = "=" * 60
+SUB = "-" * 60
+
+
+def trim(text: str, n: int = 60) -> str:
+    """Shorten text to n characters, marking truncation with an ellipsis."""
+    return text[:n] + "..." if len(text) > n else text
+
+
+def graph_client() -> httpx.AsyncClient:
+    """Build the client used for every Graph API call in a tool run.
+
+    One connection, HTTP/2 when the server negotiates it so concurrent
+    requests are multiplexed as streams; falls back to HTTP/1.1 otherwise.
+    """
+    return httpx.AsyncClient(
+        base_url=GRAPH_API_URL,
+        http2=True,
+        timeout=10.0,
+        limits=httpx.Limits(max_connections=1, max_keepalive_connections=1),
+    )
+
+
+async def fetch_posts(
+    client: httpx.AsyncClient, access_token: str, user_id: str
+) -> list[dict]:
+    """Fetch the user's Instagram posts."""
+    resp = await client.get(
+        f"/{user_id}/media",
+        params={
+            "fields": "id,caption,media_type,permalink,timestamp",
+            "access_token": access_token,
+        },
+    )
+    resp.raise_for_status()
+    return orjson.loads(resp.content).get("data", [])
+
+
+async def fetch_comments(
+    client: httpx.AsyncClient, access_token: str, media_id: str
+) -> list[dict]:
+    """Fetch all comments on a specific post, following cursor pagination.
+
+    Pages are chained by the ``after`` cursor, so they are fetched in turn;
+    COMMENTS_PAGE_SIZE keeps the number of pages (and round-trips) low.
+    """
+    params = {
+        "fields": "id,text,username,from,timestamp",
+        "limit": COMMENTS_PAGE_SIZE,
+        "access_token": access_token,
+    }
+    comments = []
+    while True:
+        resp = await client.get(f"/{media_id}/comments", params=params)
+        resp.raise_for_status()
+        body = orjson.loads(resp.content)
+        comments.extend(body.get("data", []))
+
+        paging = body.get("paging", {})
+        after = paging.get("cursors", {}).get("after")
+        if "next" not in paging or not after:
+            return comments
+        params["after"] = after
+
+
+async def fetch_comments_for_posts(
+    client: httpx.AsyncClient, access_token: str, posts: list[dict]
+) -> list[list[dict]]:
+    """Fetch every post's comments concurrently, at most FETCH_CONCURRENCY at once.
+
+    Results are returned in the same order as ``posts``.
+    """
+    sem = asyncio.Semaphore(FETCH_CONCURRENCY)
+
+    async def fetch_post_comments(post: dict) -> list[dict]:
+        async with sem:
+            return await fetch_comments(client, access_token, post["id"])
+
+    return await asyncio.gather(*(fetch_post_comments(post) for post in posts))
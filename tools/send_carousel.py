@@ -16,17 +16,20 @@ Usage (from cm-back directory):
 """
 
 import argparse
+import asyncio
 import os
 import sys
+from functools import lru_cache
 
 import httpx
+import orjson
 import psycopg
 from cryptography.fernet import Fernet
 from dotenv import load_dotenv
+from graph_api import fetch_comments_for_posts, fetch_posts, graph_client
 
 load_dotenv()
 
-GRAPH_API_URL = os.getenv("INSTAGRAM_GRAPH_API_URL", "https://graph.instagram.com")
 DEFAULT_KEYWORD = "Comment"
 
 DUMMY_CAROUSEL = [
@@ -132,24 +135,36 @@ DUMMY_CAROUSEL = [
     },
 ]
 
+# The carousel never changes, so its message body is JSON-encoded once
+CAROUSEL_MESSAGE_JSON = orjson.dumps(
+    {
+        "attachment": {
+            "type": "template",
+            "payload": {
+                "template_type": "generic",
+                "elements": DUMMY_CAROUSEL,
+            },
+        }
+    }
+)
+
 
 def get_instagram_account() -> dict:
     """Fetch the first instagram account from the database."""
-    conn = psycopg.connect(
+    # Autocommit: a single read needs no transaction held open around it
+    with psycopg.connect(
         host=os.getenv("DB_HOST", "localhost"),
         port=int(os.getenv("DB_PORT", "5432")),
         user=os.getenv("DB_USER", "postgres"),
         password=os.getenv("DB_PASSWORD", "postgres"),
         dbname=os.getenv("DB_NAME", "automation_db"),
-    )
-    with conn:
-        with conn.cursor() as cur:
-            cur.execute(
-                "SELECT instagram_user_id, username, access_token "
-                "FROM instagram_accounts LIMIT 1"
-            )
-            row = cur.fetchone()
-    conn.close()
+        autocommit=True,
+    ) as conn, conn.cursor() as cur:
+        cur.execute(
+            "SELECT instagram_user_id, username, access_token "
+            "FROM instagram_accounts LIMIT 1"
+        )
+        row = cur.fetchone()
 
     if not row:
         print("ERROR: No Instagram account found in the database.")
@@ -162,75 +177,56 @@ def get_instagram_account() -> dict:
     }
 
 
-def decrypt_token(encrypted_token: str) -> str:
-    """Decrypt the access token using ENCRYPTION_KEY from .env."""
+@lru_cache(maxsize=1)
+def get_cipher() -> Fernet:
+    """Build the Fernet cipher from ENCRYPTION_KEY in .env (once)."""
     key = os.getenv("ENCRYPTION_KEY")
     if not key:
         print("ERROR: ENCRYPTION_KEY not found in environment.")
         sys.exit(1)
-    cipher = Fernet(key.encode())
-    return cipher.decrypt(encrypted_token.encode()).decode()
-
+    return Fernet(key.encode())
 
-def fetch_posts(access_token: str, user_id: str) -> list[dict]:
-    """Fetch the user's Instagram posts."""
-    resp = httpx.get(
-        f"{GRAPH_API_URL}/{user_id}/media",
-        params={
-            "fields": "id,caption,media_type,permalink,timestamp",
-            "access_token": access_token,
-        },
-    )
-    resp.raise_for_status()
-    return resp.json().get("data", [])
 
-
-def fetch_comments(access_token: str, media_id: str) -> list[dict]:
-    """Fetch comments on a specific post."""
-    resp = httpx.get(
-        f"{GRAPH_API_URL}/{media_id}/comments",
-        params={
-            "fields": "id,text,username,from,timestamp",
-            "access_token": access_token,
-        },
-    )
-    resp.raise_for_status()
-    return resp.json().get("data", [])
+def decrypt_token(encrypted_token: str) -> str:
+    """Decrypt the access token using ENCRYPTION_KEY from .env."""
+    return get_cipher().decrypt(encrypted_token.encode()).decode()
 
 
-def send_carousel(
-    access_token: str, sender_id: str, comment_id: str, elements: list[dict]
+async def send_carousel(
+    client: httpx.AsyncClient,
+    access_token: str,
+    sender_id: str,
+    comment_id: str,
+    message_json: bytes,
 ) -> dict | None:
     """Send a carousel (generic template) DM to a commenter.
 
+    ``message_json`` is the pre-encoded message (e.g. CAROUSEL_MESSAGE_JSON);
+    only the recipient is spliced in per call.
+
     Returns the API response on success, or None if the comment_id was already used.
     """
-    payload = {
-        "recipient": {"comment_id": comment_id},
-        "message": {
-            "attachment": {
-                "type": "template",
-                "payload": {
-                    "template_type": "generic",
-                    "elements": elements,
-                },
-            }
-        },
-    }
+    body = (
+        b'{"recipient":{"comment_id":' + orjson.dumps(comment_id)
+        + b'},"message":' + message_json + b"}"
+    )
 
-    resp = httpx.post(
-        f"{GRAPH_API_URL}/{sender_id}/messages",
-        headers={"Authorization": f"Bearer {access_token}"},
-        json=payload,
+    resp = await client.post(
+        f"/{sender_id}/messages",
+        headers={
+            "Authorization": f"Bearer {access_token}",
+            "Content-Type": "application/json",
+        },
+        content=body,
     )
     if resp.status_code == 200:
-        return resp.json()
+        return orjson.loads(resp.content)
 
     print(f"    Failed ({resp.status_code}): comment_id may already be used, trying next...")
     return None
 
 
-def main():
+async def main():
     parser = argparse.ArgumentParser(
         description="Send a carousel DM to users whose comments contain a keyword."
     )
@@ -239,7 +235,7 @@ def main():
     )
     args = parser.parse_args()
 
-    keyword = args.keyword.lower()
+    keyword = args.keyword.casefold()
 
     # 1. Get account from DB
     print("Connecting to database...")
@@ -250,58 +246,63 @@ def main():
     access_token = decrypt_token(account["access_token"])
     print("Access token decrypted.")
 
-    # 3. Fetch posts and collect comments matching the keyword
-    print(f"Fetching posts and searching for keyword \"{args.keyword}\"...")
-    posts = fetch_posts(access_token, account["instagram_user_id"])
-    print(f"Found {len(posts)} posts.")
-
-    matching_comments = []
-    for post in posts:
-        caption = (post.get("caption") or "")[:60]
-        print(f"\n  Checking post {post['id']} - {caption}...")
-        comments = fetch_comments(access_token, post["id"])
-        for comment in comments:
+    # One HTTP/2 client for every Graph API call
+    async with graph_client() as client:
+        # 3. Fetch posts and collect comments matching the keyword
+        print(f"Fetching posts and searching for keyword \"{args.keyword}\"...")
+        posts = await fetch_posts(client, access_token, account["instagram_user_id"])
+        print(f"Found {len(posts)} posts.")
+
+        # Fetch every post's comments concurrently (bounded), then report in post order
+        all_comments = await fetch_comments_for_posts(client, access_token, posts)
+
+        matching_comments = []
+        for post, comments in zip(posts, all_comments):
+            caption = (post.get("caption") or "")[:60]
+            print(f"\n  Checking post {post['id']} - {caption}...")
+            for comment in comments:
+                from_data = comment.get("from", {})
+                username = comment.get("username") or from_data.get("username", "unknown")
+                text = comment.get("text", "")
+
+                if keyword in text.casefold():
+                    matching_comments.append(comment)
+                    print(f"    MATCH: @{username} ({comment['timestamp']}): \"{text}\"")
+                else:
+                    print(f"    skip:  @{username} ({comment['timestamp']}): \"{text}\"")
+
+        if not matching_comments:
+            print(f"\nNo comments containing \"{args.keyword}\" found on any post.")
+            sys.exit(1)
+
+        print(f"\nFound {len(matching_comments)} comments matching \"{args.keyword}\".")
+
+        # 4. Try sending carousel using each matching comment_id
+        print("\nCarousel cards:")
+        for i, card in enumerate(DUMMY_CAROUSEL, 1):
+            print(f"  Card {i}: {card['title']} - {card['subtitle']}")
+
+        sent_count = 0
+        for comment in matching_comments:
             from_data = comment.get("from", {})
             username = comment.get("username") or from_data.get("username", "unknown")
-            text = comment.get("text", "")
-
-            if keyword in text.lower():
-                matching_comments.append(comment)
-                print(f"    MATCH: @{username} ({comment['timestamp']}): \"{text}\"")
-            else:
-                print(f"    skip:  @{username} ({comment['timestamp']}): \"{text}\"")
-
-    if not matching_comments:
-        print(f"\nNo comments containing \"{args.keyword}\" found on any post.")
-        sys.exit(1)
-
-    print(f"\nFound {len(matching_comments)} comments matching \"{args.keyword}\".")
-
-    # 4. Try sending carousel using each matching comment_id
-    print("\nCarousel cards:")
-    for i, card in enumerate(DUMMY_CAROUSEL, 1):
-        print(f"  Card {i}: {card['title']} - {card['subtitle']}")
-
-    sent_count = 0
-    for comment in matching_comments:
-        from_data = comment.get("from", {})
-        username = comment.get("username") or from_data.get("username", "unknown")
-        print(f"\n  Trying @{username} comment_id {comment['id']} (\"{comment['text']}\")...")
-        result = send_carousel(
-            access_token,
-            account["instagram_user_id"],
-            comment["id"],
-            DUMMY_CAROUSEL,
-        )
-        if result:
-            print(f"    Carousel sent to @{username}! Message ID: {result.get('message_id', 'unknown')}")
-            sent_count += 1
+            print(f"\n  Trying @{username} comment_id {comment['id']} (\"{comment['text']}\")...")
+            result = await send_carousel(
+                client,
+                access_token,
+                account["instagram_user_id"],
+                comment["id"],
+                CAROUSEL_MESSAGE_JSON,
+            )
+            if result:
+                print(f"    Carousel sent to @{username}! Message ID: {result.get('message_id', 'unknown')}")
+                sent_count += 1
 
-    print(f"\nDone. Sent {sent_count} carousel(s) out of {len(matching_comments)} matching comments.")
-    if sent_count == 0:
-        print("All matching comment_ids were already used. Users need to comment again.")
-        sys.exit(1)
+        print(f"\nDone. Sent {sent_count} carousel(s) out of {len(matching_comments)} matching comments.")
+        if sent_count == 0:
+            print("All matching comment_ids were already used. Users need to comment again.")
+            sys.exit(1)
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
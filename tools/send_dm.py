@@ -10,38 +10,47 @@ Usage (from cm-back directory):
 """
 
 import argparse
+import asyncio
 import os
 import sys
+from functools import lru_cache
 
 import httpx
+import orjson
 import psycopg
 from cryptography.fernet import Fernet
 from dotenv import load_dotenv
+from graph_api import (
+    SEP,
+    SUB,
+    fetch_comments_for_posts,
+    fetch_posts,
+    graph_client,
+    trim,
+)
 
 load_dotenv()
 
-GRAPH_API_URL = os.getenv("INSTAGRAM_GRAPH_API_URL", "https://graph.instagram.com")
 DEFAULT_TARGET = "garvit.05"
 DEFAULT_MESSAGE = "Hey! Thanks for your comment!"
 
 
 def get_instagram_account() -> dict:
     """Fetch the first instagram account from the database."""
-    conn = psycopg.connect(
+    # Autocommit: a single read needs no transaction held open around it
+    with psycopg.connect(
         host=os.getenv("DB_HOST", "localhost"),
         port=int(os.getenv("DB_PORT", "5432")),
         user=os.getenv("DB_USER", "postgres"),
         password=os.getenv("DB_PASSWORD", "postgres"),
         dbname=os.getenv("DB_NAME", "automation_db"),
-    )
-    with conn:
-        with conn.cursor() as cur:
-            cur.execute(
-                "SELECT instagram_user_id, username, access_token "
-                "FROM instagram_accounts LIMIT 1"
-            )
-            row = cur.fetchone()
-    conn.close()
+        autocommit=True,
+    ) as conn, conn.cursor() as cur:
+        cur.execute(
+            "SELECT instagram_user_id, username, access_token "
+            "FROM instagram_accounts LIMIT 1"
+        )
+        row = cur.fetchone()
 
     if not row:
         print("ERROR: No Instagram account found in the database.")
@@ -54,46 +63,31 @@ def get_instagram_account() -> dict:
     }
 
 
-def decrypt_token(encrypted_token: str) -> str:
-    """Decrypt the access token using ENCRYPTION_KEY from .env."""
+@lru_cache(maxsize=1)
+def get_cipher() -> Fernet:
+    """Build the Fernet cipher from ENCRYPTION_KEY in .env (once)."""
     key = os.getenv("ENCRYPTION_KEY")
     if not key:
         print("ERROR: ENCRYPTION_KEY not found in environment.")
         sys.exit(1)
-    cipher = Fernet(key.encode())
-    return cipher.decrypt(encrypted_token.encode()).decode()
-
-
-def fetch_posts(access_token: str, user_id: str) -> list[dict]:
-    """Fetch the user's Instagram posts."""
-    resp = httpx.get(
-        f"{GRAPH_API_URL}/{user_id}/media",
-        params={
-            "fields": "id,caption,media_type,permalink,timestamp",
-            "access_token": access_token,
-        },
-    )
-    resp.raise_for_status()
-    return resp.json().get("data", [])
+    return Fernet(key.encode())
 
 
-def fetch_comments(access_token: str, media_id: str) -> list[dict]:
-    """Fetch comments on a specific post."""
-    resp = httpx.get(
-        f"{GRAPH_API_URL}/{media_id}/comments",
-        params={
-            "fields": "id,text,username,from,timestamp",
-            "access_token": access_token,
-        },
-    )
-    resp.raise_for_status()
-    return resp.json().get("data", [])
+def decrypt_token(encrypted_token: str) -> str:
+    """Decrypt the access token using ENCRYPTION_KEY from .env."""
+    return get_cipher().decrypt(encrypted_token.encode()).decode()
 
 
-def send_dm(access_token: str, sender_id: str, comment_id: str, message: str) -> dict:
+async def send_dm(
+    client: httpx.AsyncClient,
+    access_token: str,
+    sender_id: str,
+    comment_id: str,
+    message: str,
+) -> dict:
     """Send a DM to a commenter using their comment_id."""
-    resp = httpx.post(
-        f"{GRAPH_API_URL}/{sender_id}/messages",
+    resp = await client.post(
+        f"/{sender_id}/messages",
         headers={"Authorization": f"Bearer {access_token}"},
         json={
             "recipient": {"comment_id": comment_id},
@@ -101,10 +95,10 @@ def send_dm(access_token: str, sender_id: str, comment_id: str, message: str) ->
         },
     )
     resp.raise_for_status()
-    return resp.json()
+    return orjson.loads(resp.content)
 
 
-def main():
+async def main():
     parser = argparse.ArgumentParser(
         description="Send a DM to an Instagram user who commented on your posts."
     )
@@ -125,54 +119,64 @@ def main():
     access_token = decrypt_token(account["access_token"])
     print("Access token decrypted.")
 
-    # 3. Fetch posts
-    print("Fetching posts...")
-    posts = fetch_posts(access_token, account["instagram_user_id"])
-    print(f"Found {len(posts)} posts.")
-
-    # 4. List all comments and search for the target user
-    target_comment = None
-    for post in posts:
-        caption = (post.get("caption") or "")[:60]
-        permalink = post.get("permalink", "")
-        print(f"\n{'='*60}")
-        print(f"Post: {post['id']}")
-        print(f"Caption: {caption}{'...' if len(post.get('caption') or '') > 60 else ''}")
-        print(f"Type: {post.get('media_type', 'unknown')}")
-        print(f"Link: {permalink}")
-        print(f"Posted: {post.get('timestamp', 'unknown')}")
-        print(f"{'-'*60}")
-
-        comments = fetch_comments(access_token, post["id"])
-        if not comments:
-            print("  (no comments)")
-            continue
-
-        print(f"  Comments ({len(comments)}):")
-        for comment in comments:
-            from_data = comment.get("from", {})
-            username = comment.get("username") or from_data.get("username", "unknown")
-            text = comment.get("text", "")
-            timestamp = comment.get("timestamp", "unknown")
-            marker = " <-- TARGET" if username.lower() == args.target.lower() else ""
-            print(f"    @{username} ({timestamp}):{marker}")
-            print(f"      \"{text}\"")
-
-            if username.lower() == args.target.lower() and target_comment is None:
-                target_comment = comment
-
-    print(f"\n{'='*60}")
-    if not target_comment:
-        print(f"No comment from @{args.target} found on any post.")
-        sys.exit(1)
-
-    # 5. Send DM
-    print(f"\nSending DM to @{args.target}: \"{args.message}\"")
-    result = send_dm(
-        access_token, account["instagram_user_id"], target_comment["id"], args.message
-    )
-    print(f"DM sent! Message ID: {result.get('message_id', 'unknown')}")
+    # One HTTP/2 client for every Graph API call
+    async with graph_client() as client:
+        # 3. Fetch posts
+        print("Fetching posts...")
+        posts = await fetch_posts(client, access_token, account["instagram_user_id"])
+        print(f"Found {len(posts)} posts.")
+
+        # Fetch every post's comments concurrently (bounded), then report in post order
+        all_comments = await fetch_comments_for_posts(client, access_token, posts)
+
+        # 4. List all comments and search for the target user
+        target_lower = args.target.lower()
+        target_comment = None
+        for post, comments in zip(posts, all_comments):
+            caption = trim(post.get("caption") or "")
+            permalink = post.get("permalink", "")
+            print("\n" + SEP)
+            print(f"Post: {post['id']}")
+            print(f"Caption: {caption}")
+            print(f"Type: {post.get('media_type', 'unknown')}")
+            print(f"Link: {permalink}")
+            print(f"Posted: {post.get('timestamp', 'unknown')}")
+            print(SUB)
+
+            if not comments:
+                print("  (no comments)")
+                continue
+
+            print(f"  Comments ({len(comments)}):")
+            for comment in comments:
+                from_data = comment.get("from") or {}
+                username = comment.get("username") or from_data.get("username", "unknown")
+                text = comment.get("text", "")
+                timestamp = comment.get("timestamp", "unknown")
+                is_target = username.lower() == target_lower
+                marker = " <-- TARGET" if is_target else ""
+                print(f"    @{username} ({timestamp}):{marker}")
+                print(f"      \"{text}\"")
+
+                if is_target and target_comment is None:
+                    target_comment = comment
+
+        print("\n" + SEP)
+        if not target_comment:
+            print(f"No comment from @{args.target} found on any post.")
+            sys.exit(1)
+
+        # 5. Send DM
+        print(f"\nSending DM to @{args.target}: \"{args.message}\"")
+        result = await send_dm(
+            client,
+            access_token,
+            account["instagram_user_id"],
+            target_comment["id"],
+            args.message,
+        )
+        print(f"DM sent! Message ID: {result.get('message_id', 'unknown')}")
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
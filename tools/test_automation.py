@@ -16,34 +16,53 @@ import asyncio
 import logging
 import os
 import sys
+from collections import Counter, defaultdict
 from datetime import datetime, timezone
-from uuid import uuid4
+from functools import lru_cache
+from uuid import UUID, uuid4
 
-import httpx
+import msgspec
 import psycopg
 from cryptography.fernet import Fernet
 from dotenv import load_dotenv
+from graph_api import SEP, fetch_comments_for_posts, fetch_posts, graph_client, trim
+from sqlalchemy import Row, select
 
 load_dotenv()
 
 # Ensure the cm-back directory is on sys.path so `app` package can be imported
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-GRAPH_API_URL = os.getenv("INSTAGRAM_GRAPH_API_URL", "https://graph.instagram.com")
+from app.db import async_session_maker, engine  # noqa: E402
+from app.models import Automation, DMSentLog  # noqa: E402
+from app.schemas.webhook import InstagramWebhookEvent  # noqa: E402
+from app.services.comment_processor import CommentProcessor  # noqa: E402
+
+# Max comments run through CommentProcessor at once (bounds DB pool use)
+PROCESS_CONCURRENCY = 8
 
 # Custom formatter to mute log output color
 class MutedColorFormatter(logging.Formatter):
     GREY = "\x1b[90m"  # ANSI escape code for bright black (grey)
     RESET = "\x1b[0m"
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Escape codes are only useful on a terminal, not in piped/captured logs
+        self._use_color = sys.stdout.isatty()
+
     def format(self, record):
         message = super().format(record)
+        if not self._use_color:
+            return message
         return f"{self.GREY}{message}{self.RESET}"
 
 
 # Suppress SQLAlchemy's noisy SQL query logging
 logging.getLogger("sqlalchemy.engine").setLevel(logging.WARNING)
 logging.getLogger("sqlalchemy.pool").setLevel(logging.WARNING)
+# The app engine echoes SQL in development, which bypasses the levels above
+engine.echo = False
 
 # Configure logging to see CommentProcessor output with muted colors
 root_logger = logging.getLogger()
@@ -63,21 +82,20 @@ logger = logging.getLogger(__name__)
 
 def get_instagram_account() -> dict:
     """Fetch the first instagram account from the database."""
-    conn = psycopg.connect(
+    # Autocommit: a single read needs no transaction held open around it
+    with psycopg.connect(
         host=os.getenv("DB_HOST", "localhost"),
         port=int(os.getenv("DB_PORT", "5432")),
         user=os.getenv("DB_USER", "postgres"),
         password=os.getenv("DB_PASSWORD", "postgres"),
         dbname=os.getenv("DB_NAME", "automation_db"),
-    )
-    with conn:
-        with conn.cursor() as cur:
-            cur.execute(
-                "SELECT instagram_user_id, username, access_token "
-                "FROM instagram_accounts LIMIT 1"
-            )
-            row = cur.fetchone()
-    conn.close()
+        autocommit=True,
+    ) as conn, conn.cursor() as cur:
+        cur.execute(
+            "SELECT instagram_user_id, username, access_token "
+            "FROM instagram_accounts LIMIT 1"
+        )
+        row = cur.fetchone()
 
     if not row:
         print("ERROR: No Instagram account found in the database.")
@@ -90,40 +108,19 @@ def get_instagram_account() -> dict:
     }
 
 
-def decrypt_token(encrypted_token: str) -> str:
-    """Decrypt the access token using ENCRYPTION_KEY from .env."""
+@lru_cache(maxsize=1)
+def get_cipher() -> Fernet:
+    """Build the Fernet cipher from ENCRYPTION_KEY in .env (once)."""
     key = os.getenv("ENCRYPTION_KEY")
     if not key:
         print("ERROR: ENCRYPTION_KEY not found in environment.")
         sys.exit(1)
-    cipher = Fernet(key.encode())
-    return cipher.decrypt(encrypted_token.encode()).decode()
-
+    return Fernet(key.encode())
 
-def fetch_posts(access_token: str, user_id: str) -> list[dict]:
-    """Fetch the user's Instagram posts."""
-    resp = httpx.get(
-        f"{GRAPH_API_URL}/{user_id}/media",
-        params={
-            "fields": "id,caption,media_type,permalink,timestamp",
-            "access_token": access_token,
-        },
-    )
-    resp.raise_for_status()
-    return resp.json().get("data", [])
 
-
-def fetch_comments(access_token: str, media_id: str) -> list[dict]:
-    """Fetch comments on a specific post."""
-    resp = httpx.get(
-        f"{GRAPH_API_URL}/{media_id}/comments",
-        params={
-            "fields": "id,text,username,from,timestamp",
-            "access_token": access_token,
-        },
-    )
-    resp.raise_for_status()
-    return resp.json().get("data", [])
+def decrypt_token(encrypted_token: str) -> str:
+    """Decrypt the access token using ENCRYPTION_KEY from .env."""
+    return get_cipher().decrypt(encrypted_token.encode()).decode()
 
 
 def build_webhook_payload(
@@ -136,16 +133,16 @@ def build_webhook_payload(
 
     Matches the format that CommentEvent.from_webhook_payload() expects.
     """
-    from_data = comment.get("from", {})
+    from_data = comment.get("from") or {}
     comment_timestamp = comment.get("timestamp", "")
 
-    # Parse the Instagram timestamp to a unix timestamp
+    # Parse the Instagram timestamp to a unix timestamp. On 3.11+ fromisoformat
+    # accepts both "Z" and "+0000" offsets, so no string rewriting is needed.
     try:
-        dt = datetime.fromisoformat(comment_timestamp.replace("Z", "+00:00"))
-        unix_ts = int(dt.timestamp())
-    except (ValueError, AttributeError):
+        dt = datetime.fromisoformat(comment_timestamp)
+    except (ValueError, TypeError):
         dt = datetime.now(timezone.utc)
-        unix_ts = int(dt.timestamp())
+    unix_ts = int(dt.timestamp())
 
     return {
         "id": str(uuid4()),
@@ -182,122 +179,153 @@ async def process_comments(payloads: list[dict]) -> dict:
 
     Returns a summary dict with counts and per-comment results.
     """
-    from app.db import async_session_maker
-    from app.models import DMSentLog, Automation
-    from app.services.comment_processor import CommentProcessor
-    from sqlalchemy import select
-    from sqlalchemy.orm import joinedload
-
-    processed = 0
-    errors = 0
-    dms_sent = 0
-    dms_failed = 0
-    dms_deduped = 0
-    no_automation = 0
-
-    for payload in payloads:
-        value = payload["raw_payload"]["changes"][0]["value"]
+    values = [payload["raw_payload"]["changes"][0]["value"] for payload in payloads]
+    comment_ids = {value.get("id", "unknown") for value in values}
+    media_ids = {value["media"].get("id", "") for value in values}
+
+    # Load automations and existing dm_sent_log rows for every comment up front,
+    # instead of several round-trips per comment inside the loop
+    async with async_session_maker() as session:
+        # Only the columns printed and matched below; no ORM hydration
+        auto_result = await session.execute(
+            select(
+                Automation.id,
+                Automation.post_id,
+                Automation.name,
+                Automation.message_type,
+                Automation.trigger_type,
+            ).where(
+                Automation.post_id.in_(media_ids),
+                Automation.is_active == True,  # noqa: E712
+            )
+        )
+        automations_by_post: dict[str, list[Row]] = defaultdict(list)
+        for auto in auto_result:
+            automations_by_post[auto.post_id].append(auto)
+
+        log_result = await session.execute(
+            select(
+                DMSentLog.id,
+                DMSentLog.comment_id,
+                DMSentLog.automation_id,
+                DMSentLog.status,
+            ).where(DMSentLog.comment_id.in_(comment_ids))
+        )
+        # Rows present before processing, to detect new entries afterward
+        pre_existing: dict[str, set[UUID]] = defaultdict(set)
+        # (comment_id, automation_id) pairs a DM was already sent for
+        already_sent: set[tuple[str, UUID]] = set()
+        for log_id, log_comment_id, automation_id, status in log_result:
+            pre_existing[log_comment_id].add(log_id)
+            if status == "sent":
+                already_sent.add((log_comment_id, automation_id))
+
+    sem = asyncio.Semaphore(PROCESS_CONCURRENCY)
+
+    async def process_one(payload: dict, value: dict) -> Counter:
+        """Process a single comment in its own session.
+
+        Output is buffered and printed as one block so concurrent comments
+        don't interleave. Returns this comment's contribution to the summary.
+        """
         comment_text = value.get("text", "")
         commenter = value["from"].get("username", "unknown")
-        commenter_id = value["from"].get("id", "")
         comment_id = value.get("id", "unknown")
         media_id = value["media"].get("id", "")
 
-        print(f"\n  Processing comment {comment_id} by @{commenter}: \"{comment_text}\"")
+        counts = Counter()
+        lines = [f"\n  Processing comment {comment_id} by @{commenter}: \"{comment_text}\""]
 
-        async with async_session_maker() as session:
+        async with sem, async_session_maker() as session:
             try:
-                # Check dm_sent_log before processing to detect new entries afterward
-                pre_count_result = await session.execute(
-                    select(DMSentLog).where(
-                        DMSentLog.comment_id == comment_id,
-                    )
-                )
-                pre_existing = {row.id for row in pre_count_result.scalars().all()}
-
-                # Also check if any automation exists for this post
-                auto_result = await session.execute(
-                    select(Automation)
-                    .options(joinedload(Automation.instagram_account))
-                    .where(
-                        Automation.post_id == media_id,
-                        Automation.is_active == True,  # noqa: E712
-                    )
-                )
-                automations = list(auto_result.scalars().unique().all())
+                automations = automations_by_post.get(media_id, [])
                 if automations:
                     for auto in automations:
-                        print(f"    Automation: \"{auto.name}\" | type={auto.message_type.value} | trigger={auto.trigger_type.value}")
+                        lines.append(f"    Automation: \"{auto.name}\" | type={auto.message_type.value} | trigger={auto.trigger_type.value}")
                 else:
-                    print(f"    (no active automations for this post)")
-                    no_automation += 1
+                    lines.append(f"    (no active automations for this post)")
+                    counts["no_automation"] += 1
 
                 # Check if already deduped for each automation
-                already_sent_all = True
-                for auto in automations:
-                    dedup_result = await session.execute(
-                        select(DMSentLog).where(
-                            DMSentLog.automation_id == auto.id,
-                            DMSentLog.post_id == media_id,
-                            DMSentLog.commenter_user_id == commenter_id,
-                            DMSentLog.comment_id == comment_id,
-                            DMSentLog.status == "sent",
-                        )
-                    )
-                    if dedup_result.first() is None:
-                        already_sent_all = False
+                already_sent_all = all(
+                    (comment_id, auto.id) in already_sent for auto in automations
+                )
 
                 processor = CommentProcessor(session)
-                await processor.process(payload)
+                await processor.process(
+                    msgspec.convert(payload, InstagramWebhookEvent)
+                )
                 await session.commit()
-                processed += 1
+                counts["processed"] += 1
 
                 if not automations:
-                    continue
+                    return counts
 
                 if already_sent_all and automations:
-                    print(f"    -> SKIPPED (DM already sent — deduplication)")
-                    dms_deduped += 1
-                    continue
+                    lines.append(f"    -> SKIPPED (DM already sent — deduplication)")
+                    counts["dms_deduped"] += 1
+                    return counts
 
                 # Check dm_sent_log after processing to see what happened
                 post_count_result = await session.execute(
-                    select(DMSentLog).where(
+                    select(DMSentLog.id, DMSentLog.status).where(
                         DMSentLog.comment_id == comment_id,
                     )
                 )
-                all_entries = post_count_result.scalars().all()
-                new_entries = [e for e in all_entries if e.id not in pre_existing]
-
-                for entry in new_entries:
-                    if entry.status == "sent":
-                        print(f"    -> DM SENT to @{commenter}")
-                        dms_sent += 1
+                seen = pre_existing[comment_id]
+                new_statuses = [
+                    status for log_id, status in post_count_result if log_id not in seen
+                ]
+
+                for status in new_statuses:
+                    if status == "sent":
+                        lines.append(f"    -> DM SENT to @{commenter}")
+                        counts["dms_sent"] += 1
                     else:
-                        print(f"    -> DM FAILED (status={entry.status})")
-                        dms_failed += 1
+                        lines.append(f"    -> DM FAILED (status={status})")
+                        counts["dms_failed"] += 1
 
-                if not new_entries and automations:
-                    print(f"    -> NO DM (trigger condition not met)")
+                if not new_statuses and automations:
+                    lines.append(f"    -> NO DM (trigger condition not met)")
 
             except Exception as e:
                 await session.rollback()
-                errors += 1
-                processed += 1
-                print(f"    -> ERROR: {e}")
+                counts["errors"] += 1
+                counts["processed"] += 1
+                lines.append(f"    -> ERROR: {e}")
                 logger.error(f"Error processing comment: {e}", exc_info=True)
 
+            finally:
+                print("\n".join(lines))
+
+        return counts
+
+    results = await asyncio.gather(
+        *(process_one(payload, value) for payload, value in zip(payloads, values)),
+        return_exceptions=True,
+    )
+
+    totals = Counter()
+    for result in results:
+        if isinstance(result, BaseException):
+            # Failed outside the per-comment handler (e.g. acquiring a session)
+            logger.error(f"Error processing comment: {result}")
+            totals["errors"] += 1
+            totals["processed"] += 1
+        else:
+            totals += result
+
     return {
-        "processed": processed,
-        "dms_sent": dms_sent,
-        "dms_failed": dms_failed,
-        "dms_deduped": dms_deduped,
-        "no_automation": no_automation,
-        "errors": errors,
+        "processed": totals["processed"],
+        "dms_sent": totals["dms_sent"],
+        "dms_failed": totals["dms_failed"],
+        "dms_deduped": totals["dms_deduped"],
+        "no_automation": totals["no_automation"],
+        "errors": totals["errors"],
     }
 
 
-def main():
+async def main():
     parser = argparse.ArgumentParser(
         description="Test automation processing with real Instagram comments."
     )
@@ -318,40 +346,41 @@ def main():
     access_token = decrypt_token(account["access_token"])
     print("Access token decrypted.")
 
-    # 3. Fetch posts (or use the single specified post)
-    if args.post_id:
-        print(f"Targeting specific post: {args.post_id}")
-        posts = [{"id": args.post_id, "media_type": "UNKNOWN"}]
-    else:
-        print("Fetching posts...")
-        posts = fetch_posts(access_token, account["instagram_user_id"])
-        print(f"Found {len(posts)} posts.")
+    # One HTTP/2 client for every Graph API call
+    async with graph_client() as client:
+        # 3. Fetch posts (or use the single specified post)
+        if args.post_id:
+            print(f"Targeting specific post: {args.post_id}")
+            posts = [{"id": args.post_id, "media_type": "UNKNOWN"}]
+        else:
+            print("Fetching posts...")
+            posts = await fetch_posts(client, access_token, account["instagram_user_id"])
+            print(f"Found {len(posts)} posts.")
+
+        # Fetch every post's comments concurrently (bounded), then report in post order
+        all_comments = await fetch_comments_for_posts(client, access_token, posts)
 
-    # 4. Fetch comments and build payloads
+    # 4. Build payloads
     all_payloads = []
-    for post in posts:
+    for post, comments in zip(posts, all_comments):
         post_id = post["id"]
         media_type = post.get("media_type", "UNKNOWN")
-        caption = (post.get("caption") or "")[:60] if "caption" in post else ""
+        caption = trim(post.get("caption") or "")
 
-        if caption:
-            print(f"\n{'='*60}")
-            print(f"Post: {post_id} - {caption}{'...' if len(post.get('caption', '')) > 60 else ''}")
-        else:
-            print(f"\n{'='*60}")
-            print(f"Post: {post_id}")
+        # Buffer each post's report and write it with a single print
+        lines = ["\n" + SEP, f"Post: {post_id} - {caption}" if caption else f"Post: {post_id}"]
 
-        comments = fetch_comments(access_token, post_id)
         if not comments:
-            print("  (no comments)")
+            lines.append("  (no comments)")
+            print("\n".join(lines))
             continue
 
-        print(f"  Found {len(comments)} comments:")
+        lines.append(f"  Found {len(comments)} comments:")
         for comment in comments:
-            from_data = comment.get("from", {})
+            from_data = comment.get("from") or {}
             username = comment.get("username") or from_data.get("username", "unknown")
             text = comment.get("text", "")
-            print(f"    @{username}: \"{text}\"")
+            lines.append(f"    @{username}: \"{text}\"")
 
             payload = build_webhook_payload(
                 account_id=account["instagram_user_id"],
@@ -361,19 +390,21 @@ def main():
             )
             all_payloads.append(payload)
 
+        print("\n".join(lines))
+
     if not all_payloads:
         print("\nNo comments found to process.")
         sys.exit(0)
 
-    print(f"\n{'='*60}")
+    print("\n" + SEP)
     print(f"Processing {len(all_payloads)} comments through CommentProcessor...")
-    print(f"{'='*60}")
+    print(SEP)
 
-    # 5. Run through CommentProcessor (async)
-    summary = asyncio.run(process_comments(all_payloads))
+    # 5. Run through CommentProcessor
+    summary = await process_comments(all_payloads)
 
     # 6. Print summary
-    print(f"\n{'='*60}")
+    print("\n" + SEP)
     print("Summary:")
     print(f"  Comments processed:  {summary['processed']}")
     print(f"  DMs sent:            {summary['dms_sent']}")
@@ -381,8 +412,8 @@ def main():
     print(f"  DMs skipped (dedup): {summary['dms_deduped']}")
     print(f"  No automation:       {summary['no_automation']}")
     print(f"  Errors:              {summary['errors']}")
-    print(f"{'='*60}")
+    print(SEP)
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())